@@ -3,10 +3,12 @@
 import curses
 import time
 import os
+import logging
 import traceback
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from datetime import datetime
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Any, Optional, Tuple
 
 # All imports must now be relative to the package root
@@ -19,94 +21,126 @@ from .navigation_system.screen_manager import ScreenManager
 from .ui.layout_manager import LayoutManager
 from .ui.color_manager import ColorManager
 from .navigation_system.input_handler import InputHandler
-from .screens.dashboard import DashboardScreen
-from .screens.file_manager import FileManagerScreen
-from .screens.search import SearchScreen
-from .screens.search_results import SearchResultsScreen
-from .screens.replace import ReplaceScreen
-from .screens.batch_operations import BatchOperationsScreen
-# from .screens.settings import SettingsScreen
-# from .screens.help import HelpScreen
+# Screen modules are imported by the ScreenManager on first navigation (see register_screens)
+
+def _get_error_logger() -> logging.Logger:
+    """Logger for runtime errors; its file handler is created once and opened on first write."""
+    logger = logging.getLogger("epub_editor_pro")
+    if not logger.handlers:
+        handler = RotatingFileHandler("logs/runtime_error.log", maxBytes=1_000_000, backupCount=5,
+                                      encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("Timestamp: %(asctime)s\n%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False # Never print to the terminal while curses owns it
+    return logger
 
 @dataclass
 class CoreModules:
     """A container for all core logic and shared state."""
     layout: LayoutManager
-    epub_path: Optional[str] = None
+    epub_path: Optional[Path] = None
     last_search_results: List[Any] = field(default_factory=list)
     content_manager: ContentManager = field(default_factory=ContentManager)
     search_engine: SearchEngine = field(init=False)
     replace_engine: ReplaceEngine = field(init=False)
     epub_saver: EPUBSaver = field(init=False)
+    executor: ThreadPoolExecutor = field(init=False)
 
     def __post_init__(self):
         # Engines depend on the content_manager, so initialize them here.
-        self.search_engine = SearchEngine(self.content_manager)
+        # One search worker pool serves the whole session.
+        self.executor = ThreadPoolExecutor(max_workers=4)  # Optimized for mobile CPUs
+        self.search_engine = SearchEngine(self.content_manager, self.executor)
         self.replace_engine = ReplaceEngine(self.content_manager)
         self.epub_saver = EPUBSaver(self.content_manager)
 
     def load_epub(self, file_path: str) -> Tuple[bool, str]:
         """Helper method to load an EPUB, resetting the core state."""
         self.content_manager = ContentManager()
-        self.__post_init__() # Re-initialize engines with the new manager
+        # Rebind the engines instead of recreating them, so no new worker threads are started
+        self.search_engine.reset(self.content_manager)
+        self.replace_engine.reset(self.content_manager)
+        self.epub_saver = EPUBSaver(self.content_manager)
 
+        epub_path = Path(file_path)
         loader = EPUBLoader()
-        if not loader.load_epub(Path(file_path)):
+        if not loader.load_epub(epub_path):
             return False, "Failed to load EPUB content."
         
-        for path, content in loader.content_map.items():
-            self.content_manager.add_file(path, content)
+        self.content_manager.bulk_add(loader.content_map.items())
             
-        self.epub_path = file_path
-        return True, f"Loaded {len(loader.content_map)} files."
+        self.epub_path = epub_path
+        return True, f"Loaded {len(self.content_manager.content_map)} files."
 
 class EPUBEditorPro:
+    FRAME_MS = 33                 # Longest getch wait per loop iteration (~30 FPS)
+    IDLE_REDRAW_INTERVAL = 0.25   # Seconds between redraws of animating screens while no input arrives
+
     def __init__(self, stdscr):
         self.stdscr = stdscr
         theme = ColorManager(stdscr)
         input_handler = InputHandler(stdscr)
         layout = LayoutManager(stdscr)
         self.core_modules = CoreModules(layout=layout)
+        self.logger = _get_error_logger()
         self.screen_manager = ScreenManager(stdscr, theme, input_handler, self.core_modules)
         self.register_screens()
         
     def register_screens(self):
-        """Register all application screens."""
+        """Register all application screens as "module:Class" paths, imported when first shown."""
         self.screen_manager.screen_classes = {
-            "dashboard": DashboardScreen, "file_manager": FileManagerScreen,
-            "search": SearchScreen, "search_results": SearchResultsScreen,
-            "replace": ReplaceScreen, "batch_ops": BatchOperationsScreen,
+            "dashboard": ".screens.dashboard:DashboardScreen",
+            "file_manager": ".screens.file_manager:FileManagerScreen",
+            "search": ".screens.search:SearchScreen",
+            "search_results": ".screens.search_results:SearchResultsScreen",
+            "replace": ".screens.replace:ReplaceScreen",
+            "batch_ops": ".screens.batch_operations:BatchOperationsScreen",
         }
 
     def run(self):
         """Main application loop."""
-        self.stdscr.nodelay(True)
+        # getch waits up to one frame, so the loop idles in curses instead of
+        # polling, and a key press wakes it immediately.
+        self.screen_manager.input_handler.set_frame_timeout(self.FRAME_MS)
         self.screen_manager.navigate_to("dashboard")
+        last_draw = 0.0
         
-        while self.screen_manager.running:
-            try:
+        # Any error ends the session (handle_error stops the loop), so one
+        # handler around the whole loop is enough.
+        try:
+            while self.screen_manager.running:
                 self.screen_manager.handle_input()
                 self.screen_manager.update()
-                self.screen_manager.draw()
-                self.stdscr.refresh()
-                time.sleep(1 / 30) # 30 FPS target
-            except Exception as e:
-                self.handle_error(e)
+                now = time.monotonic()
+                # Redraw on input or navigation; otherwise only while something
+                # on screen changes by itself, and then at IDLE_REDRAW_INTERVAL.
+                if self.screen_manager.is_dirty() or (
+                        self.screen_manager.wants_tick() and now - last_draw >= self.IDLE_REDRAW_INTERVAL):
+                    self.screen_manager.draw()
+                    # curses diffs the virtual screen against what the terminal
+                    # shows, so only changed cells are sent; one doupdate also
+                    # flushes any subwindows staged with noutrefresh.
+                    self.stdscr.noutrefresh()
+                    curses.doupdate()
+                    last_draw = now
+        except Exception as e:
+            self.handle_error(e)
         self.exit_app()
 
     def handle_error(self, exception):
         self.screen_manager.running = False # Stop the loop on error
-        # Error logging should go to the user's data directory
-        with open("logs/runtime_error.log", "w") as f:
-            f.write(f"Timestamp: {datetime.now()}\n")
-            traceback.print_exc(file=f)
+        # Error logging should go to the user's data directory (the working directory)
+        self.logger.error("Unhandled exception in main loop", exc_info=exception)
 
     def exit_app(self):
+        self.core_modules.executor.shutdown(wait=False)
         curses.nocbreak(); self.stdscr.keypad(False); curses.echo(); curses.endwin()
 
 def start_app(stdscr):
     """Main application logic, wrapped by curses."""
     curses.curs_set(0)
+    # The cursor is hidden, so doupdate need not move it back after each frame
+    stdscr.leaveok(True)
     app = EPUBEditorPro(stdscr)
     app.run()
 
@@ -1,18 +1,43 @@
 import re
 import hashlib
 import sys
+from array import array
+from bisect import bisect_right
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Set
 from collections import defaultdict
 from xml.etree import ElementTree as ET
 
+try:
+    import xxhash  # optional non-cryptographic hash for change detection
+except ImportError:
+    xxhash = None
+
+# Compiled once; words are lowercased per match rather than per line
+_WORD_RE = re.compile(r'\w+')
+
+# Postings are packed as flat unsigned int arrays [line, pos, line, pos, ...]
+# (8 bytes per posting instead of a tuple of two int objects).
+_POSTING_TYPECODE = 'I'
+_LINE_START_TYPECODE = 'L'
+
+def _iter_postings(entries: array):
+    """Yield (line_num, position) pairs from a packed postings array"""
+    it = iter(entries)
+    return zip(it, it)
+
 class ContentManager:
     def __init__(self):
         self.content_map: Dict[str, str] = {}          # File path → content
-        self.original_content: Dict[str, str] = {}     # Original content copies
         self.modified_files: Set[str] = set()          # Track modified files
-        self.change_history: Dict[str, List[Tuple]] = defaultdict(list)  # File path → [(old_text, new_text)]
-        self.file_index: Dict[str, List[Tuple]] = defaultdict(list)      # Word → [(file_path, line_num, position)]
+        self.change_history: Dict[str, List[Tuple[int, List[str], int]]] = defaultdict(list)  # File path → [(first_line_idx, old_lines, new_line_count)]
+        self.file_index: Dict[str, Dict[str, array]] = defaultdict(dict)  # Word → {file_path: array([line_num, position, ...])}
+        self.file_words: Dict[str, Set[str]] = defaultdict(set)         # File path → words indexed for it
+        self.content_hashes: Dict[Tuple[str, bool], str] = {}           # (file_path, crypto) → cached hex digest
+        self.line_starts: Dict[str, array] = {}                          # File path → offset of each line, built lazily
+        self.content_bytes = 0                                           # Running sys.getsizeof total of content_map
+        self.history_bytes = 0                                           # Running sys.getsizeof total of history lines
+        self.on_change: List[Callable[[str], None]] = []                 # Called with the file path after its content changes
         self.encoding = 'utf-8'
         self.stats = {
             'total_files': 0,
@@ -26,12 +51,37 @@ class ContentManager:
         if not self._validate_content(content):
             return False
             
-        self.content_map[file_path] = content
-        self.original_content[file_path] = content
-        self._update_stats_add(content)
-        self._index_content(file_path, content)
+        self._set_content(file_path, content)
+        self.line_starts.pop(file_path, None)
+        # Indexing already tokenizes every word, so its count feeds the stats
+        word_count = self._index_content(file_path, content)
+        self._update_stats_add(content, word_count)
+        self._notify_change(file_path)
         return True
 
+    def bulk_add(self, files: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """
+        Add many files at once, e.g. a freshly loaded EPUB. Stats are totalled and
+        listeners notified once for the whole batch. Returns the number added.
+        """
+        added: List[str] = []
+        total_chars = total_words = 0
+        for file_path, content in files:
+            if content is None or not self._validate_content(content):
+                continue
+            self._set_content(file_path, content)
+            self.line_starts.pop(file_path, None)
+            total_words += self._index_content(file_path, content)
+            total_chars += len(content)
+            added.append(file_path)
+
+        self.stats['total_files'] += len(added)
+        self.stats['total_chars'] += total_chars
+        self.stats['total_words'] += total_words
+        for file_path in added:
+            self._notify_change(file_path)
+        return len(added)
+
     def get_content(self, file_path: str) -> Optional[str]:
         """Get content for a file"""
         return self.content_map.get(file_path)
@@ -48,13 +98,16 @@ class ContentManager:
         
         # Only track if content actually changed
         if old_content != new_content:
-            self.content_map[file_path] = new_content
+            self._set_content(file_path, new_content)
             if file_path not in self.modified_files:
                 self.modified_files.add(file_path)
                 self.stats['modified_count'] = len(self.modified_files)
 
-            self.change_history[file_path].append((old_content, new_content))
-            self._reindex_file(file_path, old_content, new_content)
+            # Only the changed lines are kept, so history grows with edit size, not file size
+            edit = self._reindex_file(file_path, old_content, new_content)
+            self.change_history[file_path].append(edit)
+            self.history_bytes += self._lines_size(edit[1])
+            self._notify_change(file_path)
             return True
         return False
 
@@ -71,33 +124,168 @@ class ContentManager:
         if file_path not in self.change_history or not self.change_history[file_path] or steps < 1:
             return False
             
+        history = self.change_history[file_path]
         current_content = self.content_map.get(file_path)
-        # Rollback through history steps
-        for _ in range(min(steps, len(self.change_history[file_path]))):
-            old_content, _ = self.change_history[file_path].pop()
-            
-        # The content to revert to is the "old_content" of the last popped history item
-        # If history becomes empty, we revert to original content
-        if not self.change_history[file_path]:
-            new_content = self.original_content[file_path]
+        lines = current_content.split('\n')
+        # Rollback through history steps, restoring the replaced lines of each edit
+        for _ in range(min(steps, len(history))):
+            start, old_lines, new_line_count = history.pop()
+            lines[start:start + new_line_count] = old_lines
+            self.history_bytes -= self._lines_size(old_lines)
+        new_content = '\n'.join(lines)
+
+        # With the history exhausted the file is back to its original content
+        if not history:
             self.modified_files.discard(file_path)
             self.stats['modified_count'] = len(self.modified_files)
-        else:
-            # The new "current" content is the "old" content from the last undone change
-            new_content = self.change_history[file_path][-1][0]
 
-        self.content_map[file_path] = new_content
+        self._set_content(file_path, new_content)
         self._reindex_file(file_path, current_content, new_content)
+        self._notify_change(file_path)
         return True
 
-    def get_content_hash(self, file_path: str) -> str:
-        """Get SHA256 hash of file content"""
-        content = self.content_map.get(file_path, '')
-        return hashlib.sha256(content.encode(self.encoding)).hexdigest()
+    def _notify_change(self, file_path: str) -> None:
+        """Tell listeners (e.g. search caches) that a file's content changed"""
+        for callback in self.on_change:
+            callback(file_path)
+
+    def _set_content(self, file_path: str, content: str) -> None:
+        """Store content, keeping the memory total and hash cache in sync"""
+        previous = self.content_map.get(file_path)
+        if previous is not None:
+            self.content_bytes -= sys.getsizeof(previous)
+        self.content_map[file_path] = content
+        self.content_bytes += sys.getsizeof(content)
+        self._invalidate_hash(file_path)
+
+    @staticmethod
+    def _lines_size(lines: List[str]) -> int:
+        """Memory held by a history entry's lines"""
+        return sum(sys.getsizeof(line) for line in lines)
+
+    def get_content_hash(self, file_path: str, use_crypto_hash: bool = True) -> str:
+        """
+        Get a hash of file content, cached until the content changes.
+        SHA256 by default; with use_crypto_hash=False a faster non-cryptographic
+        digest (xxh3_128 if installed, else BLAKE2b) is used for change detection.
+        """
+        key = (file_path, use_crypto_hash)
+        cached = self.content_hashes.get(key)
+        if cached is not None:
+            return cached
+
+        data = self.content_map.get(file_path, '').encode(self.encoding, 'surrogatepass')
+        if use_crypto_hash:
+            digest = hashlib.sha256(data).hexdigest()
+        elif xxhash is not None:
+            digest = xxhash.xxh3_128(data).hexdigest()
+        else:
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        if file_path in self.content_map:
+            self.content_hashes[key] = digest
+        return digest
+
+    def _invalidate_hash(self, file_path: str) -> None:
+        """Drop cached hashes for a file whose content changed"""
+        self.content_hashes.pop((file_path, True), None)
+        self.content_hashes.pop((file_path, False), None)
+
+    def get_line_starts(self, file_path: str) -> Optional[array]:
+        """Get the character offset at which each line of a file starts"""
+        starts = self.line_starts.get(file_path)
+        if starts is None:
+            content = self.content_map.get(file_path)
+            if content is None:
+                return None
+            starts = array(_LINE_START_TYPECODE, [0])
+            find = content.find
+            pos = find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find('\n', pos + 1)
+            self.line_starts[file_path] = starts
+        return starts
+
+    def line_span(self, file_path: str, line_number: int) -> Optional[Tuple[int, int]]:
+        """Get the (start, end) offsets of a 1-based line, excluding its newline"""
+        starts = self.get_line_starts(file_path)
+        if starts is None or not (1 <= line_number <= len(starts)):
+            return None
+        end = starts[line_number] - 1 if line_number < len(starts) else len(self.content_map[file_path])
+        return starts[line_number - 1], end
+
+    def locate(self, file_path: str, offset: int) -> Optional[Tuple[int, int]]:
+        """Map a character offset to a 1-based (line_number, column)"""
+        starts = self.get_line_starts(file_path)
+        if starts is None or not (0 <= offset <= len(self.content_map[file_path])):
+            return None
+        line_idx = bisect_right(starts, offset) - 1
+        return line_idx + 1, offset - starts[line_idx]
+
+    def _update_line_starts(self, file_path: str, new_lines: List[str], prefix: int,
+                            suffix: int, char_delta: int) -> None:
+        """Patch cached line offsets after an edit instead of rescanning the file"""
+        starts = self.line_starts.get(file_path)
+        if starts is None:
+            return
+        line_delta = len(new_lines) - len(starts)
+        # Lines up to and including the first changed one start where they did before
+        new_starts = starts[:min(prefix + 1, len(new_lines))]
+        offset = new_starts[-1]
+        for i in range(len(new_starts), len(new_lines) - suffix):
+            offset += len(new_lines[i - 1]) + 1
+            new_starts.append(offset)
+        # Lines after the edit move by the change in length
+        tail_from = max(len(new_starts), len(new_lines) - suffix)
+        new_starts.extend(start + char_delta for start in starts[tail_from - line_delta:])
+        self.line_starts[file_path] = new_starts
 
     def search_index(self, word: str) -> List[Tuple]:
         """Find positions of a word using the index"""
-        return self.file_index.get(word.lower(), [])
+        postings = self.file_index.get(word.lower())
+        if not postings:
+            return []
+        return [(file_path, line_num, pos)
+                for file_path, entries in postings.items()
+                for line_num, pos in _iter_postings(entries)]
+
+    def phrase_search(self, phrase: str) -> List[Tuple]:
+        """
+        Find positions of a multi-word phrase within a line using the index.
+        Posting lists narrow the search to files and lines holding every word
+        (rarest word first); only those lines are scanned to confirm word order.
+        """
+        words = [word.lower() for word in _WORD_RE.findall(phrase)]
+        if len(words) < 2:
+            return self.search_index(words[0]) if words else []
+
+        buckets = [self.file_index.get(word) for word in set(words)]
+        if not all(buckets):
+            return []
+        buckets.sort(key=len)
+
+        phrase_regex = re.compile(r'\b' + r'\W+'.join(map(re.escape, words)) + r'\b', re.IGNORECASE)
+        results = []
+        for file_path, entries in buckets[0].items():
+            if not all(file_path in bucket for bucket in buckets[1:]):
+                continue
+            candidates = set(entries[::2])
+            for bucket in buckets[1:]:
+                candidates.intersection_update(bucket[file_path][::2])
+                if not candidates:
+                    break
+            if not candidates:
+                continue
+
+            content = self.content_map[file_path]
+            line_starts = self.get_line_starts(file_path)
+            for line_num in sorted(candidates):
+                line_start = line_starts[line_num - 1]
+                line_end = line_starts[line_num] - 1 if line_num < len(line_starts) else len(content)
+                for match in phrase_regex.finditer(content, line_start, line_end):
+                    results.append((file_path, line_num, match.start() - line_start))
+        return results
 
     def _validate_content(self, content: str) -> bool:
         """Validate content before storing. Keep it simple and fast."""
@@ -106,69 +294,118 @@ class ContentManager:
             return False
         return True
 
-    def _update_stats_add(self, content: str) -> None:
+    def _update_stats_add(self, content: str, word_count: int) -> None:
         """Update statistics counters when adding a new file"""
         self.stats['total_files'] += 1
         self.stats['total_chars'] += len(content)
-        self.stats['total_words'] += len(re.findall(r'\w+', content))
+        self.stats['total_words'] += word_count
 
-    def _update_stats_modify(self, old_content: str, new_content: str) -> None:
+    def _update_stats_modify(self, char_delta: int, word_delta: int) -> None:
         """Update statistics counters when modifying content"""
-        self.stats['total_chars'] += len(new_content) - len(old_content)
-        self.stats['total_words'] += len(re.findall(r'\w+', new_content)) - len(re.findall(r'\w+', old_content))
-
-    def _index_content(self, file_path: str, content: str) -> None:
-        """Index content for fast searching"""
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            # Using finditer is more efficient as it gives both word and position in one pass
-            for match in re.finditer(r'\w+', line.lower()):
-                word = match.group(0)
-                pos = match.start()
-                self.file_index[word].append((file_path, line_num, pos))
-
-    def _reindex_file(self, file_path: str, old_content: str, new_content: str) -> None:
+        self.stats['total_chars'] += char_delta
+        self.stats['total_words'] += word_delta
+
+    def _index_content(self, file_path: str, content: str) -> int:
+        """Index content for fast searching. Returns the word count."""
+        return self._index_lines(file_path, content.split('\n'), 1)
+
+    def _index_lines(self, file_path: str, lines: List[str], first_line_num: int) -> int:
+        """Add postings for a run of lines starting at first_line_num. Returns the word count."""
+        # Collect this file's postings locally, then merge once per distinct word
+        # instead of doing two index lookups for every token.
+        postings: Dict[str, List[int]] = defaultdict(list)
+        finditer = _WORD_RE.finditer
+        count = 0
+        for line_num, line in enumerate(lines, first_line_num):
+            for match in finditer(line):
+                postings[match.group().lower()] += (line_num, match.start())
+                count += 1
+
+        file_index = self.file_index
+        for word, entries in postings.items():
+            bucket = file_index[word]
+            if file_path in bucket:
+                bucket[file_path].extend(entries)
+            else:
+                bucket[file_path] = array(_POSTING_TYPECODE, entries)
+        self.file_words[file_path].update(postings)
+        return count
+
+    def _reindex_file(self, file_path: str, old_content: str, new_content: str) -> Tuple[int, List[str], int]:
         """
         Efficiently update index after content change.
-        This is a critical performance optimization.
+        Only the lines between the common prefix and common suffix of the old and
+        new content are re-tokenized; postings after the edit are shifted if the
+        line count changed.
+        Returns the edit as (first_line_idx, old_lines, new_line_count) for undo.
         """
-        # 1. Get unique words from old and new content
-        old_words = set(re.findall(r'\w+', old_content.lower()))
-        new_words = set(re.findall(r'\w+', new_content.lower()))
-        
-        # 2. Words to remove from index for this file
-        words_to_remove = old_words - new_words
-        for word in words_to_remove:
-            if word in self.file_index:
-                self.file_index[word] = [entry for entry in self.file_index[word] if entry[0] != file_path]
-                if not self.file_index[word]:
+        old_lines = old_content.split('\n')
+        new_lines = new_content.split('\n')
+
+        # 1. Find the changed line range with a prefix/suffix match
+        shortest = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < shortest and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < shortest - prefix
+               and old_lines[-1 - suffix] == new_lines[-1 - suffix]):
+            suffix += 1
+
+        self._update_line_starts(file_path, new_lines, prefix, suffix, len(new_content) - len(old_content))
+
+        old_changed = old_lines[prefix:len(old_lines) - suffix]
+        new_changed = new_lines[prefix:len(new_lines) - suffix]
+        first_changed = prefix + 1                       # 1-based, inclusive
+        last_changed = prefix + len(old_changed)         # 1-based, inclusive
+        line_delta = len(new_lines) - len(old_lines)
+
+        # 2. Drop postings on the changed lines. If lines were added or removed,
+        #    every posting after the edit moves, so all of the file's words are visited.
+        old_word_count = 0
+        if line_delta:
+            affected = list(self.file_words[file_path])
+            for line in old_changed:
+                old_word_count += len(_WORD_RE.findall(line))
+        else:
+            affected = set()
+            for line in old_changed:
+                line_words = _WORD_RE.findall(line)
+                old_word_count += len(line_words)
+                affected.update(word.lower() for word in line_words)
+
+        words = self.file_words[file_path]
+        for word in affected:
+            bucket = self.file_index.get(word)
+            if not bucket or file_path not in bucket:
+                continue
+            kept = array(_POSTING_TYPECODE)
+            for line_num, pos in _iter_postings(bucket[file_path]):
+                if line_num < first_changed:
+                    kept.append(line_num)
+                elif line_num > last_changed:
+                    kept.append(line_num + line_delta)
+                else:
+                    continue
+                kept.append(pos)
+            if kept:
+                bucket[file_path] = kept
+            else:
+                del bucket[file_path]
+                words.discard(word)
+                if not bucket:
                     del self.file_index[word]
-        
-        # 3. Words to add/update in the index
-        words_to_update = new_words
-        # First, clear previous entries for the file for words that are being re-indexed
-        for word in words_to_update.intersection(old_words):
-             if word in self.file_index:
-                self.file_index[word] = [entry for entry in self.file_index[word] if entry[0] != file_path]
-
-        # Now, re-index the new content for all words it contains
-        lines = new_content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            for match in re.finditer(r'\w+', line.lower()):
-                word = match.group(0)
-                pos = match.start()
-                self.file_index[word].append((file_path, line_num, pos))
 
-        # 4. Update statistics
-        self._update_stats_modify(old_content, new_content)
+        # 3. Re-tokenize only the changed lines
+        new_word_count = self._index_lines(file_path, new_changed, first_changed)
 
+        # 4. Update statistics
+        self._update_stats_modify(len(new_content) - len(old_content), new_word_count - old_word_count)
+        return prefix, old_changed, len(new_changed)
 
     def get_memory_usage(self) -> int:
-        """Estimate memory usage in bytes using a more accurate method."""
-        total_size = sum(sys.getsizeof(c) for c in self.content_map.values())
-        total_size += sum(sys.getsizeof(c) for c in self.original_content.values())
-        total_size += sys.getsizeof(self.file_index)
-        return total_size
+        """Estimate memory usage in bytes from running totals kept on every edit."""
+        return self.content_bytes + self.history_bytes + sys.getsizeof(self.file_index)
 
     def get_file_stats(self, file_path: str) -> Dict:
         """Get statistics for a specific file"""
@@ -176,6 +413,6 @@ class ContentManager:
         return {
             'size': len(content),
             'lines': content.count('\n') + 1,
-            'words': len(re.findall(r'\w+', content)),
+            'words': len(_WORD_RE.findall(content)),
             'modifications': len(self.change_history.get(file_path, []))
         }
\ No newline at end of file
@@ -1,14 +1,67 @@
+import os
 import zipfile
 import re
 import shutil
+import threading
 from pathlib import Path
 from typing import Dict, Tuple, Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from xml.etree import ElementTree as ET
 
+try:
+    from lxml import etree as lxml_etree  # optional libxml2-backed parser
+except ImportError:
+    lxml_etree = None
+
+# Namespaces are crucial for parsing container.xml and .opf files
+_CONTAINER_NS = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container'}
+_OPF_NS = {
+    'opf': 'http://www.idpf.org/2007/opf',
+    'dc': 'http://purl.org/dc/elements/1.1/'
+}
+
+if lxml_etree is not None:
+    # No entity expansion or network access for untrusted EPUB input
+    _XML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=False)
+    _XML_ERRORS = (ET.ParseError, lxml_etree.XMLSyntaxError)
+    _find_rootfile = lxml_etree.XPath('c:rootfiles/c:rootfile', namespaces=_CONTAINER_NS)
+    _find_manifest_items = lxml_etree.XPath('opf:manifest/opf:item', namespaces=_OPF_NS)
+    _find_spine_itemrefs = lxml_etree.XPath('opf:spine/opf:itemref', namespaces=_OPF_NS)
+else:
+    _XML_PARSER = None
+    _XML_ERRORS = (ET.ParseError,)
+    _find_rootfile = lambda root: root.findall('c:rootfiles/c:rootfile', _CONTAINER_NS)
+    _find_manifest_items = lambda root: root.findall('opf:manifest/opf:item', _OPF_NS)
+    _find_spine_itemrefs = lambda root: root.findall('opf:spine/opf:itemref', _OPF_NS)
+
+def _parse_xml(data: bytes):
+    """Parse an XML document with lxml when available, else ElementTree"""
+    if _XML_PARSER is not None:
+        return lxml_etree.fromstring(data, _XML_PARSER)
+    return ET.fromstring(data)
+
+# The XML declaration must open the document, so only the head of a file is scanned
+_XML_DECL_SCAN_BYTES = 256
+_XML_ENCODING_RE = re.compile(br'^\s*<\?xml\b[^>]{0,200}?encoding\s*=\s*["\']([^"\']+)["\']')
+
+def _ext(path: str) -> str:
+    """Return the lowercased extension of a path (including the dot), or ''"""
+    dot = path.rfind('.')
+    return path[dot:].lower() if dot != -1 else ''
+
 class EPUBLoader:
+    _CONTENT_EXTS = frozenset({'.html', '.xhtml', '.xml', '.opf', '.ncx', '.css', '.js', '.txt'})
+    _EXT_TO_BUCKET = {
+        '.html': 'html', '.xhtml': 'html',
+        '.css': 'styles',
+        '.opf': 'metadata_files', '.ncx': 'metadata_files',
+        '.jpg': 'images', '.jpeg': 'images', '.png': 'images', '.gif': 'images', '.svg': 'images', '.webp': 'images',
+        '.ttf': 'fonts', '.otf': 'fonts', '.woff': 'fonts', '.woff2': 'fonts',
+    }
+
     def __init__(self):
         self.epub_path: Optional[Path] = None
-        self.content_map: Dict[str, str] = {}
+        self.content_map: Dict[str, str] = {}      # Path → decoded text, manifest order
         self.metadata: Dict[str, any] = {}
         self.structure: Dict[str, list] = {}
         self.progress_callback = None
@@ -58,73 +111,91 @@ class EPUBLoader:
                 opf_dir = Path(opf_path).parent
                 self._parse_opf(epub, opf_path, opf_dir)
 
-                total_files = len(self.manifest)
-                for i, (item_id, href) in enumerate(self.manifest.items()):
-                    file_path_in_zip = str(opf_dir / href).replace('\\', '/')
-                    
-                    if self.progress_callback:
-                        self.progress_callback(i, total_files, f"Loading {file_path_in_zip}")
-                    
-                    try:
-                        content = epub.read(file_path_in_zip)
-                        if self._is_content_file(href):
-                            encoding = self._detect_encoding(content)
-                            self.content_map[file_path_in_zip] = content.decode(encoding)
-                        else:
-                            # For binary files, we could store them as bytes or ignore
-                            pass
-                    except (KeyError, UnicodeDecodeError):
-                        # File in manifest but not in zip, or not text; skip.
-                        continue
-                
-                self._analyze_structure()
-                return True
-        except (zipfile.BadZipFile, OSError, ET.ParseError):
+                content_paths = [
+                    str(opf_dir / href).replace('\\', '/')
+                    for href in self.manifest.values() if self._is_content_file(href)
+                ]
+
+            self._load_content_files(file_path, content_paths)
+            self._analyze_structure()
+            return True
+        except (zipfile.BadZipFile, OSError) + _XML_ERRORS:
             return False
 
+    def _load_content_files(self, file_path: Path, content_paths: List[str]) -> None:
+        """Read and decode text files on a thread pool; zlib inflate and decoding release the GIL."""
+        # ZipFile handles are not safe to share between threads, so each worker opens its own
+        local = threading.local()
+        handles: List[zipfile.ZipFile] = []
+
+        def read_file(path_in_zip: str) -> Optional[str]:
+            epub = getattr(local, 'epub', None)
+            if epub is None:
+                epub = local.epub = zipfile.ZipFile(file_path, 'r')
+                handles.append(epub)
+            try:
+                content = epub.read(path_in_zip)
+                return content.decode(self._detect_encoding(content))
+            except (KeyError, UnicodeDecodeError, LookupError):
+                # File in manifest but not in zip, or not decodable text; skip.
+                return None
+
+        decoded: Dict[str, Optional[str]] = {}
+        total_files = len(content_paths)
+        try:
+            with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:  # Optimized for mobile CPUs
+                futures = {executor.submit(read_file, path): path for path in content_paths}
+                for i, future in enumerate(as_completed(futures)):
+                    path_in_zip = futures[future]
+                    if self.progress_callback:
+                        self.progress_callback(i, total_files, f"Loading {path_in_zip}")
+                    decoded[path_in_zip] = future.result()
+        finally:
+            for epub in handles:
+                epub.close()
+
+        # Keep manifest order regardless of completion order
+        for path_in_zip in content_paths:
+            if decoded.get(path_in_zip) is not None:
+                self.content_map[path_in_zip] = decoded[path_in_zip]
+
     def _get_opf_path(self, epub: zipfile.ZipFile) -> Optional[str]:
         """Parse container.xml to find the .opf file path"""
         try:
             container_data = epub.read('META-INF/container.xml')
-            root = ET.fromstring(container_data)
-            # Namespace for container.xml
-            ns = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container'}
-            rootfile = root.find('c:rootfiles/c:rootfile', ns)
-            if rootfile is not None:
-                return rootfile.get('full-path')
+            root = _parse_xml(container_data)
+            rootfiles = _find_rootfile(root)
+            if rootfiles:
+                return rootfiles[0].get('full-path')
             return None
-        except (KeyError, ET.ParseError):
+        except (KeyError,) + _XML_ERRORS:
             return None
 
     def _parse_opf(self, epub: zipfile.ZipFile, opf_path: str, opf_dir: Path):
         """Parse the .opf file for manifest, spine, and metadata."""
         opf_data = epub.read(opf_path)
-        root = ET.fromstring(opf_data)
-        
-        # Namespaces are crucial for parsing .opf files
-        ns = {
-            'opf': 'http://www.idpf.org/2007/opf',
-            'dc': 'http://purl.org/dc/elements/1.1/'
-        }
+        root = _parse_xml(opf_data)
 
         # Parse manifest
-        for item in root.findall('opf:manifest/opf:item', ns):
+        for item in _find_manifest_items(root):
             item_id = item.get('id')
             href = item.get('href')
             if item_id and href:
                 self.manifest[item_id] = href
         
         # Parse spine (reading order)
-        for itemref in root.findall('opf:spine/opf:itemref', ns):
+        for itemref in _find_spine_itemrefs(root):
             idref = itemref.get('idref')
             if idref and idref in self.manifest:
                 # Store the href (actual file path) in the spine
                 self.spine.append(str(opf_dir / self.manifest[idref]).replace('\\', '/'))
 
         # Parse metadata
-        metadata_elem = root.find('opf:metadata', ns)
+        metadata_elem = root.find('opf:metadata', _OPF_NS)
         if metadata_elem is not None:
             for child in metadata_elem:
+                if not isinstance(child.tag, str):
+                    continue # lxml yields comments and processing instructions
                 tag = child.tag.split('}')[-1]
                 # Handle attributes, e.g., opf:role on dc:creator
                 attribs = {key.split('}')[-1]: value for key, value in child.attrib.items()}
@@ -139,46 +210,32 @@ class EPUBLoader:
 
     def _is_content_file(self, file_name: str) -> bool:
         """Check if file is text-based content"""
-        return any(file_name.lower().endswith(ext) for ext in 
-                ['.html', '.xhtml', '.xml', '.opf', '.ncx', '.css', '.js', '.txt'])
+        return _ext(file_name) in self._CONTENT_EXTS
 
     def _detect_encoding(self, content: bytes) -> str:
         """Detect text encoding"""
-        if content.startswith(b'\xef\xbb\xbf'):
+        head = content[:_XML_DECL_SCAN_BYTES]
+        if head.startswith(b'\xef\xbb\xbf'):
             return 'utf-8-sig' # More specific for BOM
-        if content.startswith(b'\xff\xfe') or content.startswith(b'\xfe\xff'):
+        if head.startswith((b'\xff\xfe', b'\xfe\xff')):
             return 'utf-16'
         
-        try:
-            # Check XML declaration, a more robust way
-            match = re.search(br'^\s*<\?xml[^>]+encoding="([^"]+)"', content)
-            if match:
-                return match.group(1).decode('ascii')
-        except (re.error, IndexError):
-            pass
+        # Check XML declaration, a more robust way
+        match = _XML_ENCODING_RE.match(head)
+        if match:
+            return match.group(1).decode('ascii')
         
         # Default to UTF-8 as per EPUB spec for files without BOM or declaration
         return 'utf-8'
 
     def _analyze_structure(self) -> None:
         """Analyze file relationships and structure from the manifest."""
-        file_list = list(self.content_map.keys())
         self.structure = {
             'html': [], 'styles': [], 'metadata_files': [], 'images': [], 'fonts': [], 'other': []
         }
-        for file_path in file_list:
-            if file_path.lower().endswith(('.html', '.xhtml')):
-                self.structure['html'].append(file_path)
-            elif file_path.lower().endswith('.css'):
-                self.structure['styles'].append(file_path)
-            elif file_path.lower().endswith(('.opf', '.ncx')):
-                self.structure['metadata_files'].append(file_path)
-            elif re.search(r'\.(jpg|jpeg|png|gif|svg|webp)$', file_path, re.I):
-                self.structure['images'].append(file_path)
-            elif re.search(r'\.(ttf|otf|woff|woff2)$', file_path, re.I):
-                self.structure['fonts'].append(file_path)
-            else:
-                self.structure['other'].append(file_path)
+        bucket_for = self._EXT_TO_BUCKET.get
+        for file_path in self.content_map:
+            self.structure[bucket_for(_ext(file_path), 'other')].append(file_path)
 
     def create_backup(self, backup_path: Path) -> bool:
         """Create backup of original EPUB"""
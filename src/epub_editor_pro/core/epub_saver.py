@@ -112,14 +112,18 @@ class EPUBSaver:
     def _rotate_backups(self, backup_dir: Path) -> None:
         """Rotate backups to prevent storage overflow."""
         try:
-            backups = sorted(
-                [p for p in backup_dir.glob("*.bak") if p.is_file()],
-                key=os.path.getmtime
-            )
+            # scandir entries carry the file type, so each backup costs one stat (for mtime)
+            with os.scandir(backup_dir) as entries:
+                backups = sorted(
+                    (entry.stat().st_mtime, entry.path) for entry in entries
+                    if entry.name.endswith(".bak") and entry.is_file()
+                )
             
-            while len(backups) > self.max_backups:
-                oldest_backup = backups.pop(0)
-                oldest_backup.unlink()
+            for _, oldest_backup in backups[:max(0, len(backups) - self.max_backups)]:
+                try:
+                    os.unlink(oldest_backup)
+                except FileNotFoundError:
+                    pass
         except OSError:
             # Ignore errors during rotation (e.g., file locked)
             pass
@@ -0,0 +1,97 @@
+import re
+import functools
+from typing import Optional
+
+try:
+    import re2  # google-re2: optional linear-time (DFA) engine
+except ImportError:
+    re2 = None
+
+try:
+    import pcre2  # optional PCRE2 binding; patterns are JIT-compiled to machine code
+except ImportError:
+    pcre2 = None
+
+# re2's character classes and word boundaries are ASCII-only, so patterns using
+# them stay on `re` to keep Unicode EPUB text matching the same way.
+_ASCII_ONLY_CLASSES = re.compile(r'\\[wWbBdDsS]')
+
+# Without (?m), re2's $ matches only at the very end; re's also matches before a final newline
+_UNESCAPED_DOLLAR = re.compile(r'(?<!\\)(?:\\\\)*\$')
+
+# PCRE2's \Z also matches before a final newline, unlike re's; POSIX classes like
+# [[:alpha:]] are a class in PCRE2 but a plain character set followed by ']' in re
+_PCRE2_DIVERGENT = re.compile(r'\\Z|\[:\^?[a-z]+:\]')
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(
+    pattern: str,
+    case_sensitive: bool,
+    regex_mode: bool,
+    whole_word: bool,
+    multiline: bool = False,
+    use_re2: bool = False,
+    use_pcre2: bool = False
+) -> Optional[re.Pattern]:
+    """
+    Compile a search/replace pattern, shared by SearchEngine and ReplaceEngine.
+    Compiled patterns are immutable, so sharing them is safe. Returns None if invalid.
+    """
+    if regex_mode:
+        source = pattern
+    else:
+        source = re.escape(pattern)
+        if whole_word:
+            source = r'\b' + source + r'\b'
+
+    # Escaped literals can't backtrack, and re's literal search beats both bindings
+    if use_re2 and regex_mode:
+        compiled = _compile_re2(source, case_sensitive, multiline)
+        if compiled is not None:
+            return compiled
+    if use_pcre2 and regex_mode:
+        compiled = _compile_pcre2(source, case_sensitive, multiline)
+        if compiled is not None:
+            return compiled
+
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if multiline:
+        flags |= re.MULTILINE
+    try:
+        return re.compile(source, flags)
+    except re.error:
+        return None
+
+def _compile_re2(source: str, case_sensitive: bool, multiline: bool):
+    """Compile with re2 when installed and the pattern means the same there; otherwise None."""
+    if re2 is None or _ASCII_ONLY_CLASSES.search(source):
+        return None
+    if not multiline and _UNESCAPED_DOLLAR.search(source):
+        return None
+    options = re2.Options()
+    options.case_sensitive = case_sensitive
+    options.log_errors = False
+    if multiline:
+        # re2 has no multiline option outside POSIX syntax; the inline flag works
+        source = '(?m)' + source
+    try:
+        return re2.compile(source, options)
+    except re2.error:
+        # Backreferences, lookaround etc. are not supported by re2
+        return None
+
+def _compile_pcre2(source: str, case_sensitive: bool, multiline: bool):
+    """
+    JIT-compile with PCRE2 when installed; otherwise None. Only for matching:
+    PCRE2 expands $1 in replacement templates, so replacements must stay on re.
+    """
+    if pcre2 is None or _PCRE2_DIVERGENT.search(source):
+        return None
+    flags = 0 if case_sensitive else pcre2.IGNORECASE
+    if multiline:
+        flags |= pcre2.MULTILINE
+    try:
+        return pcre2.compile(source, flags)
+    except pcre2.LibraryError:
+        # Syntax PCRE2 rejects (e.g. variable-length lookbehind) may still be valid for re
+        return None
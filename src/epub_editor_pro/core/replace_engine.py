@@ -1,8 +1,11 @@
 import re
 import difflib
-from typing import Dict, List, Tuple, Optional
+import itertools
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Optional
 from .content_manager import ContentManager
 from .search_engine import SearchResult
+from .regex_cache import compile_pattern
 
 class ReplacementStats:
     __slots__ = ('total_replacements', 'files_modified', 'failed_files', 'characters_changed')
@@ -21,9 +24,11 @@ class ReplacementStats:
 class ReplaceEngine:
     def __init__(self, content_manager: ContentManager):
         self.content_manager = content_manager
-        # History stores (file_path, line_number, original_line_content)
-        self.replacement_history: List[Tuple[str, int, str]] = []
         self.max_history = 50  # Limit for mobile devices
+        # History stores (file_path, line_number, original_line_content); oldest entries fall off the left
+        self.replacement_history: Deque[Tuple[str, int, str]] = deque(maxlen=self.max_history)
+        # Opt-in: re2 avoids catastrophic backtracking but is several times slower than re on non-ASCII text
+        self.use_re2 = False
 
     def replace(
         self,
@@ -38,19 +43,18 @@ class ReplaceEngine:
         if content is None:
             return False
             
-        lines = content.split('\n')
-        if not (1 <= line_number <= len(lines)):
+        # Locate the line by offset instead of splitting the whole file
+        span = self.content_manager.line_span(file_path, line_number)
+        if span is None:
             return False
             
-        line_index = line_number - 1
-        original_line = lines[line_index]
+        line_start, line_end = span
+        original_line = content[line_start:line_end]
         if not (0 <= start_pos <= end_pos <= len(original_line)):
             return False
             
-        # Create new line content
-        new_line = original_line[:start_pos] + new_text + original_line[end_pos:]
-        lines[line_index] = new_line
-        new_content = '\n'.join(lines)
+        # Splice the new text straight into the content
+        new_content = content[:line_start + start_pos] + new_text + content[line_start + end_pos:]
         
         # Update content and track history
         if self.content_manager.update_content(file_path, new_content):
@@ -59,9 +63,6 @@ class ReplaceEngine:
                 line_number,
                 original_line  # Store the entire original line for robust undo
             ))
-            # Limit history size
-            if len(self.replacement_history) > self.max_history:
-                self.replacement_history.pop(0)
             return True
         return False
 
@@ -84,6 +85,11 @@ class ReplaceEngine:
         search_regex = self._compile_pattern(pattern, case_sensitive, regex_mode, whole_word)
         if not search_regex:
             return stats
+
+        # Outside regex mode the replacement is plain text: escape backslashes once so
+        # subn copies it verbatim instead of expanding it as a template.
+        if not regex_mode and '\\' in replacement:
+            replacement = replacement.replace('\\', r'\\')
             
         modified_files_in_batch = set()
 
@@ -107,6 +113,58 @@ class ReplaceEngine:
         stats.files_modified = len(modified_files_in_batch)
         return stats
 
+    def bulk_literal_replace(
+        self,
+        mapping: Dict[str, str],
+        case_sensitive: bool = False,
+        whole_word: bool = False,
+        files_to_process: Optional[List[str]] = None
+    ) -> ReplacementStats:
+        """
+        Replace many literal terms in a single pass per file.
+        All terms are combined into one alternation (longest first, so the longest
+        term wins at a given position), and each match is looked up in the mapping.
+        """
+        stats = ReplacementStats()
+        terms = [term for term in mapping if term]
+        if not terms:
+            return stats
+
+        if files_to_process is None:
+            files_to_process = list(self.content_manager.content_map.keys())
+
+        if case_sensitive:
+            lookup = {term: mapping[term] for term in terms}
+        else:
+            lookup = {term.lower(): mapping[term] for term in terms}
+
+        alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        if whole_word:
+            alternation = r'\b(?:' + alternation + r')\b'
+        search_regex = re.compile(alternation, 0 if case_sensitive else re.IGNORECASE)
+
+        def substitute(match):
+            text = match.group(0)
+            key = text if case_sensitive else text.lower()
+            return lookup.get(key, text)
+
+        for file_path in files_to_process:
+            content = self.content_manager.get_content(file_path)
+            if content is None:
+                continue
+
+            new_content, num_replacements = search_regex.subn(substitute, content)
+
+            if num_replacements > 0:
+                if self.content_manager.update_content(file_path, new_content):
+                    stats.total_replacements += num_replacements
+                    stats.characters_changed += len(new_content) - len(content)
+                    stats.files_modified += 1
+                else:
+                    stats.failed_files += 1
+
+        return stats
+
     def undo_last_replacement(self) -> bool:
         """Undo the last replacement operation. This is more robust as it restores the whole line."""
         if not self.replacement_history:
@@ -120,15 +178,14 @@ class ReplaceEngine:
         if content is None:
             return False
             
-        lines = content.split('\n')
-        if not (1 <= line_number <= len(lines)):
+        span = self.content_manager.line_span(file_path, line_number)
+        if span is None:
             # History is out of sync with content, can't undo
             return False
         
-        # Undo the replacement by restoring the original line
-        line_index = line_number - 1
-        lines[line_index] = original_line
-        new_content = '\n'.join(lines)
+        # Undo the replacement by restoring the original line in place
+        line_start, line_end = span
+        new_content = content[:line_start] + original_line + content[line_end:]
         
         # We call update_content which handles re-indexing and change history
         return self.content_manager.update_content(file_path, new_content)
@@ -140,19 +197,8 @@ class ReplaceEngine:
         regex_mode: bool,
         whole_word: bool
     ) -> Optional[re.Pattern]:
-        """Compile a regex pattern for replacement"""
-        flags = 0 if case_sensitive else re.IGNORECASE
-        
-        try:
-            if regex_mode:
-                return re.compile(pattern, flags)
-            else:
-                escaped = re.escape(pattern)
-                if whole_word:
-                    return re.compile(r'\b' + escaped + r'\b', flags)
-                return re.compile(escaped, flags)
-        except re.error:
-            return None
+        """Compile a regex pattern for replacement (cached across calls)"""
+        return compile_pattern(pattern, case_sensitive, regex_mode, whole_word, use_re2=self.use_re2)
 
     def _replace_in_content(
         self,
@@ -161,13 +207,21 @@ class ReplaceEngine:
         replacement: str
     ) -> Tuple[str, int]:
         """Replace all matches in content and count replacements using re.subn for efficiency."""
-        # re.subn returns a tuple: (new_string, number_of_subs_made)
+        # re.subn returns a tuple: (new_string, number_of_subs_made). It joins the
+        # unchanged slices in C and returns the input object itself when nothing
+        # matched, so no Python-level accumulator is needed here.
         new_content, num_replacements = pattern.subn(replacement, content)
         return new_content, num_replacements
 
+    def reset(self, content_manager: ContentManager) -> None:
+        """Rebind to a new ContentManager; history from the old one no longer applies"""
+        self.content_manager = content_manager
+        self.replacement_history.clear()
+
     def get_replacement_history(self, max_items: int = 10) -> List[Tuple]:
         """Get recent replacement history"""
-        return list(self.replacement_history[-max_items:])
+        start = max(0, len(self.replacement_history) - max_items)
+        return list(itertools.islice(self.replacement_history, start, None))
     
     def replace_by_results(self, results_to_replace: List[SearchResult], new_text: str) -> ReplacementStats:
         """
@@ -189,20 +243,35 @@ class ReplaceEngine:
             content = self.content_manager.get_content(file_path)
             if not content: continue
     
-            lines = content.split('\n')
+            # Splice by absolute offsets instead of splitting the file into lines.
+            # Walking backwards, the untouched text after each match is emitted once.
+            line_starts = self.content_manager.get_line_starts(file_path)
+            line_count = len(line_starts)
+            parts: List[str] = []
+            tail = len(content)
             file_replacements = 0
             
             for res in results:
-                line_idx = res.line_number - 1
-                if 0 <= line_idx < len(lines):
-                    line = lines[line_idx]
-                    # Double-check that the original text is still there before replacing
-                    if line[res.start_pos:res.end_pos] == res.match_text:
-                        lines[line_idx] = line[:res.start_pos] + new_text + line[res.end_pos:]
-                        file_replacements += 1
+                if not (1 <= res.line_number <= line_count):
+                    continue
+                line_start = line_starts[res.line_number - 1]
+                line_end = line_starts[res.line_number] - 1 if res.line_number < line_count else len(content)
+                start = line_start + res.start_pos
+                end = line_start + res.end_pos
+                # Skip results outside their line or overlapping one already replaced
+                if not (line_start <= start <= end <= min(line_end, tail)):
+                    continue
+                # Double-check that the original text is still there before replacing
+                if content[start:end] == res.match_text:
+                    parts.append(content[end:tail])
+                    parts.append(new_text)
+                    tail = start
+                    file_replacements += 1
     
             if file_replacements > 0:
-                new_content = '\n'.join(lines)
+                parts.append(content[:tail])
+                parts.reverse()
+                new_content = ''.join(parts)
                 if self.content_manager.update_content(file_path, new_content):
                     stats.total_replacements += file_replacements
                     stats.files_modified += 1
@@ -1,8 +1,21 @@
 import re
 import time
+import itertools
+from collections import OrderedDict
+from bisect import bisect_right
 from typing import List, Dict, Tuple, Optional, Generator
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor
 from .content_manager import ContentManager
+from .regex_cache import compile_pattern
+
+try:
+    from rapidfuzz.distance import Levenshtein as _native_levenshtein  # optional C++ edit distance
+except ImportError:
+    _native_levenshtein = None
+
+# Whole-text anchors and lookarounds see neighbouring lines in a buffer scan, so
+# patterns using them are matched one line at a time, as they always were.
+_LINE_SCOPED = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[AZz]|\(\?<?[=!])')
 
 class SearchResult:
     __slots__ = ('file_path', 'line_number', 'start_pos', 'end_pos', 'match_text', 'context_before', 'context_after')
@@ -14,21 +27,29 @@ class SearchResult:
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.match_text = match_text
+        # Small slices, not offsets into the file: results outlive edits to their content
         self.context_before = context_before
         self.context_after = context_after
 
 class SearchEngine:
-    def __init__(self, content_manager: ContentManager):
+    def __init__(self, content_manager: ContentManager, executor: Optional[Executor] = None):
         self.content_manager = content_manager
-        self.search_cache: Dict[str, List[SearchResult]] = {}
+        # Most recently used last; results go stale on any edit, so the cache is cleared then
+        self.search_cache: 'OrderedDict[Tuple[str, bool, bool, bool, int], List[SearchResult]]' = OrderedDict()
+        self.max_cache_entries = 16
         self.last_search_stats = {
             'pattern': '',
             'time_taken': 0,
             'results_count': 0,
+            'truncated': False,
             'files_searched': 0,
             'options': {}
         }
-        self.executor = ThreadPoolExecutor(max_workers=4)  # Optimized for mobile CPUs
+        # Callers that create several engines should pass one shared pool
+        self.executor = executor or ThreadPoolExecutor(max_workers=4)  # Optimized for mobile CPUs
+        self.use_re2 = True  # Linear-time re2 when installed; patterns it can't express use re
+        self.use_pcre2 = True  # JIT-compiled PCRE2 for regex-mode searches when installed (after re2)
+        content_manager.on_change.append(self._on_content_changed)
 
     def search(
         self, 
@@ -36,19 +57,22 @@ class SearchEngine:
         case_sensitive: bool = False, 
         regex_mode: bool = False,
         whole_word: bool = False,
-        context_size: int = 30
+        context_size: int = 30,
+        max_results: int = 10000
     ) -> List[SearchResult]:
-        """Perform search across all content with various options"""
+        """Perform search across all content with various options, stopping at max_results"""
         start_time = time.time()
-        cache_key = self._generate_cache_key(pattern, case_sensitive, regex_mode, whole_word)
+        cache_key = (pattern, case_sensitive, regex_mode, whole_word, max_results)
         
         # Check cache first
         if cache_key in self.search_cache:
+            self.search_cache.move_to_end(cache_key)
             results = self.search_cache[cache_key]
             self.last_search_stats = {
                 'pattern': pattern,
                 'time_taken': 0,  # Not actual search time but useful for UI
                 'results_count': len(results),
+                'truncated': len(results) >= max_results,
                 'files_searched': len(self.content_manager.content_map),
                 'options': {
                     'case_sensitive': case_sensitive,
@@ -63,6 +87,14 @@ class SearchEngine:
         if not search_regex:
             return []
         
+        # Case-insensitive regex scans can't use re's literal fast search, so an ASCII
+        # literal is matched case-sensitively against a lowercased copy of ASCII files.
+        folded_regex = None
+        if not case_sensitive and not regex_mode and pattern.isascii():
+            folded_regex = self._build_search_regex(pattern.lower(), True, False, whole_word)
+        
+        per_line = regex_mode and _LINE_SCOPED.search(pattern) is not None
+        
         # Search all files in parallel
         results = []
         files = list(self.content_manager.content_map.keys())
@@ -74,23 +106,36 @@ class SearchEngine:
                 self._search_file, 
                 file_path, 
                 search_regex, 
-                context_size
+                context_size,
+                folded_regex,
+                max_results,
+                per_line
             ) for file_path in files
         ]
         
         for future in future_results:
+            if len(results) >= max_results:
+                # Enough results; files not yet started are skipped
+                future.cancel()
+                continue
             try:
                 results.extend(future.result())
             except Exception as e:
                 # Log or handle errors from individual file searches to prevent crashing the entire operation
                 print(f"Warning: Could not search a file due to an error: {e}")
         
+        truncated = len(results) >= max_results
+        del results[max_results:]
+        
         # Update cache and stats
         self.search_cache[cache_key] = results
+        if len(self.search_cache) > self.max_cache_entries:
+            self.search_cache.popitem(last=False)
         self.last_search_stats.update({
             'pattern': pattern,
             'time_taken': time.time() - start_time,
             'results_count': len(results),
+            'truncated': truncated,
             'options': {
                 'case_sensitive': case_sensitive,
                 'regex_mode': regex_mode,
@@ -107,32 +152,72 @@ class SearchEngine:
         regex_mode: bool,
         whole_word: bool
     ) -> Optional[re.Pattern]:
-        """Compile regex pattern based on search options"""
-        flags = 0 if case_sensitive else re.IGNORECASE
-        
-        if regex_mode:
-            try:
-                return re.compile(pattern, flags)
-            except re.error:
-                return None
-        else:
-            # Escape special characters for literal search
-            escaped_pattern = re.escape(pattern)
-            if whole_word:
-                return re.compile(r'\b' + escaped_pattern + r'\b', flags)
-            return re.compile(escaped_pattern, flags)
+        """Compile regex pattern based on search options (cached across calls)"""
+        # Files are scanned as one buffer, so anchors must still bind to lines
+        return compile_pattern(pattern, case_sensitive, regex_mode, whole_word,
+                               multiline=regex_mode, use_re2=self.use_re2, use_pcre2=self.use_pcre2)
 
     def _search_file(
         self, 
         file_path: str, 
         search_regex: re.Pattern, 
-        context_size: int
+        context_size: int,
+        folded_regex: Optional[re.Pattern] = None,
+        limit: Optional[int] = None,
+        per_line: bool = False
     ) -> List[SearchResult]:
-        """Search within a single file"""
+        """Search within a single file, returning at most limit results"""
         content = self.content_manager.get_content(file_path)
         if not content:
             return []
+        if per_line:
+            return self._search_lines(file_path, content, search_regex, context_size, limit)
+        
+        scan_text, scan_regex = content, search_regex
+        # Lowercasing ASCII text is a cheap byte map that keeps every offset; other
+        # text costs more to lowercase than the case-insensitive scan saves.
+        if folded_regex is not None and content.isascii():
+            scan_text, scan_regex = content.lower(), folded_regex
         
+        # Scan the whole buffer in one finditer call and map each match back to
+        # its line through the cached line offsets, instead of looping per line.
+        results = []
+        line_starts = self.content_manager.get_line_starts(file_path)
+        line_count = len(line_starts)
+        content_len = len(content)
+        
+        for match in scan_regex.finditer(scan_text):
+            start, end = match.span()
+            line_idx = bisect_right(line_starts, start) - 1
+            line_start = line_starts[line_idx]
+            line_end = line_starts[line_idx + 1] - 1 if line_idx + 1 < line_count else content_len
+            if end > line_end:
+                # Matches never spanned lines before; keep those results identical
+                return self._search_lines(file_path, content, search_regex, context_size, limit)
+            
+            results.append(SearchResult(
+                file_path=file_path,
+                line_number=line_idx + 1,
+                start_pos=start - line_start,
+                end_pos=end - line_start,
+                match_text=content[start:end],
+                context_before=content[max(line_start, start - context_size):start],
+                context_after=content[end:min(line_end, end + context_size)]
+            ))
+            if len(results) == limit:
+                break
+        
+        return results
+
+    def _search_lines(
+        self, 
+        file_path: str, 
+        content: str,
+        search_regex: re.Pattern, 
+        context_size: int,
+        limit: Optional[int] = None
+    ) -> List[SearchResult]:
+        """Search a file line by line, for patterns that can match across a newline"""
         results = []
         lines = content.split('\n')
         
@@ -141,98 +226,107 @@ class SearchEngine:
                 start, end = match.span()
                 match_text = match.group()
                 
-                # Extract context
-                context_start = max(0, start - context_size)
-                context_end = min(len(line), end + context_size)
-                context_before = line[context_start:start]
-                context_after = line[end:context_end]
-                
                 results.append(SearchResult(
                     file_path=file_path,
                     line_number=line_num,
                     start_pos=start,
                     end_pos=end,
                     match_text=match_text,
-                    context_before=context_before,
-                    context_after=context_after
+                    context_before=line[max(0, start - context_size):start],
+                    context_after=line[end:end + context_size]
                 ))
+                if len(results) == limit:
+                    return results
         
         return results
 
-    def _generate_cache_key(
-        self, 
-        pattern: str, 
-        case_sensitive: bool, 
-        regex_mode: bool,
-        whole_word: bool
-    ) -> str:
-        """Generate unique cache key for search parameters"""
-        return f"{pattern}|{int(case_sensitive)}|{int(regex_mode)}|{int(whole_word)}"
-
     def get_search_history(self, max_items: int = 10) -> List[Dict]:
         """Get recent search patterns"""
         # Simple implementation - real system would persist history
+        start = max(0, len(self.search_cache) - max_items)
         return [
-            {'pattern': key.split('|')[0], 'count': len(results)}
-            for key, results in list(self.search_cache.items())[-max_items:]
+            {'pattern': key[0], 'count': len(results)}
+            for key, results in itertools.islice(self.search_cache.items(), start, None)
         ]
 
     def fuzzy_search(self, pattern: str, max_distance: int = 2, context_size: int = 30) -> List[SearchResult]:
         """
         Approximate/fuzzy search (simplified implementation).
-        NOTE: This implementation is much more performant than the original, but the core
-        `_find_closest_match` still uses a brute-force sliding window, which can be slow on very long lines.
-        For typical EPUB content, this should be acceptable.
-        This fuzzy search is always case-insensitive.
+        A bit-parallel (bitap) scan finds candidate windows in one pass per line; only
+        those candidates pay for an exact Levenshtein check.
+        This fuzzy search is always case-insensitive, and always pure Python (re2 has no edit distance).
         """
         results = []
         pattern_lower = pattern.lower()
+        if not pattern_lower:
+            return results
+        window = len(pattern_lower)
         
         for file_path, content in self.content_manager.content_map.items():
             lines = content.split('\n')
             for line_num, line in enumerate(lines, 1):
                 line_lower = line.lower()
                 pos_in_line = 0
-                while pos_in_line < len(line_lower):
-                    match_start = self._find_closest_match(line_lower, pattern_lower, pos_in_line, max_distance)
-                    
-                    if match_start == -1:
-                        break
+                for match_start in self._approx_match_starts(line_lower, pattern_lower, max_distance):
+                    if match_start < pos_in_line:
+                        continue
+                    substring = line_lower[match_start:match_start + window]
+                    if self._levenshtein_distance(substring, pattern_lower) > max_distance:
+                        continue
 
                     match_end = match_start + len(pattern)
                     match_text = line[match_start:match_end]
 
-                    # Extract context
-                    context_start = max(0, match_start - context_size)
-                    context_end = min(len(line), match_end + context_size)
-                    context_before = line[context_start:match_start]
-                    context_after = line[match_end:context_end]
-
                     results.append(SearchResult(
                         file_path=file_path,
                         line_number=line_num,
                         start_pos=match_start,
                         end_pos=match_end,
                         match_text=match_text,
-                        context_before=context_before,
-                        context_after=context_after
+                        context_before=line[max(0, match_start - context_size):match_start],
+                        context_after=line[match_end:match_end + context_size]
                     ))
                     
                     pos_in_line = match_end
         
         return results
 
-    def _find_closest_match(self, text: str, pattern: str, start_pos: int, max_distance: int) -> int:
-        """Find closest approximate match position in a string, starting from start_pos."""
+    def _approx_match_starts(self, text: str, pattern: str, max_distance: int) -> List[int]:
+        """
+        Offsets of pattern-length windows that may be within max_distance edits of pattern.
+        Wu-Manber bitap: bit i of state[d] is set when pattern[:i+1] matches a suffix of the
+        text read so far with at most d edits. Every true match is reported; callers verify.
+        """
         pattern_len = len(pattern)
-        for i in range(start_pos, len(text) - pattern_len + 1):
-            substring = text[i:i+pattern_len]
-            if self._levenshtein_distance(substring, pattern) <= max_distance:
-                return i
-        return -1
+        last_start = len(text) - pattern_len
+        if last_start < 0:
+            return []
+        full = (1 << pattern_len) - 1
+        accept = 1 << (pattern_len - 1)
+        char_masks: Dict[str, int] = {}
+        for i, ch in enumerate(pattern):
+            char_masks[ch] = char_masks.get(ch, 0) | (1 << i)
+
+        state = [(1 << d) - 1 for d in range(max_distance + 1)]
+        starts = []
+        for end, ch in enumerate(text, 1):
+            mask = char_masks.get(ch, 0)
+            previous = state[0]
+            state[0] = ((previous << 1) | 1) & mask
+            for d in range(1, max_distance + 1):
+                current = state[d]
+                # match | insertion | substitution and deletion
+                state[d] = ((((current << 1) | 1) & mask) | previous
+                            | ((previous | state[d - 1]) << 1) | 1) & full
+                previous = current
+            if state[max_distance] & accept and 0 <= end - pattern_len <= last_start:
+                starts.append(end - pattern_len)
+        return starts
 
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Calculate Levenshtein distance between two strings (space-optimized)."""
+        if _native_levenshtein is not None:
+            return _native_levenshtein.distance(s1, s2)
         if len(s1) < len(s2):
             return self._levenshtein_distance(s2, s1)
         
@@ -251,6 +345,21 @@ class SearchEngine:
         
         return previous_row[-1]
 
+    def reset(self, content_manager: ContentManager) -> None:
+        """Rebind to a new ContentManager (e.g. a newly loaded EPUB), keeping the executor"""
+        if self._on_content_changed in self.content_manager.on_change:
+            self.content_manager.on_change.remove(self._on_content_changed)
+        self.content_manager = content_manager
+        content_manager.on_change.append(self._on_content_changed)
+        self.search_cache.clear()
+
+    def _on_content_changed(self, file_path: str) -> None:
+        """
+        Drop cached results when any file changes. Evicting only that file's
+        results would miss matches the edit created, so every entry goes.
+        """
+        self.search_cache.clear()
+
     def clear_cache(self) -> None:
         """Clear search cache to free memory"""
         self.search_cache.clear()
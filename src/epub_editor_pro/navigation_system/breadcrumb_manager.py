@@ -2,14 +2,25 @@
 
 import curses
 import json
+from bisect import bisect_right
+from functools import lru_cache, partial
 from pathlib import Path
 from collections import deque
 from typing import List, Tuple, Dict, Callable, Optional, Any
 
 # Assume MaterialComponent and MaterialChip are in this path
-from ..ui.material_components import MaterialComponent, MaterialChip, MaterialTheme
+from ..ui.material_components import MaterialComponent, MaterialChip, MaterialTheme, cell_width, center_cells
 from ..ui.layout_manager import LayoutRegion
 
+_MAX_NAME_LENGTH = 15 # Longer crumb names are cut and end in "…"
+
+@lru_cache(maxsize=256)
+def _display_name(name: str) -> str:
+    """Crumb label, truncated once per distinct name."""
+    if len(name) <= _MAX_NAME_LENGTH:
+        return name
+    return f"{name[:_MAX_NAME_LENGTH - 1]}…"
+
 class BreadcrumbManager(MaterialComponent):
     def __init__(self, theme: 'MaterialTheme', region: LayoutRegion, on_crumb_click: Callable[[str], None]):
         super().__init__(theme, region)
@@ -18,6 +29,13 @@ class BreadcrumbManager(MaterialComponent):
         self.on_crumb_click = on_crumb_click
         self.home_icon = "🏠"
         self.separator = "›"
+        self._sep_prefix = self.separator + " " # Leads every crumb label
+        self._home_width = cell_width(self.home_icon) + 2
+        self._layout_dirty = True # Chip positions need recomputing
+        self._layout_region: Optional[Tuple[int, int, int]] = None # (x, y, width) last laid out in
+        self._visible_chips: List[MaterialChip] = []
+        self._chip_xs: List[int] = [] # Left edge of each visible chip, ascending
+        self._joined_line = "" # Visible chips rendered side by side, for single-call drawing
 
     def add_crumb(self, name: str, path: str, data: Any = None):
         """Add a new breadcrumb to the trail."""
@@ -25,19 +43,30 @@ class BreadcrumbManager(MaterialComponent):
         if self.breadcrumbs and self.breadcrumbs[-1][1] == path:
             return
             
+        if not self.chips:
+            self.breadcrumbs.append((name, path, data))
+            self._update_chips()
+            return
+
+        # Only the new crumb needs a chip; drop the evicted one's (chips[0] is home)
+        if len(self.breadcrumbs) == self.breadcrumbs.maxlen:
+            del self.chips[1]
         self.breadcrumbs.append((name, path, data))
-        self._update_chips()
+        self.chips.append(self._make_chip(len(self.breadcrumbs) - 1, name, path))
+        self._layout_dirty = True
         
     def go_back(self, steps: int = 1) -> Optional[Tuple[str, str, Any]]:
         """
         Removes the last 'steps' crumbs and returns the new last crumb.
         Returns None if the trail becomes empty.
         """
-        for _ in range(steps):
-            if self.breadcrumbs:
-                self.breadcrumbs.pop()
+        removed = min(steps, len(self.breadcrumbs))
+        for _ in range(removed):
+            self.breadcrumbs.pop()
         
-        self._update_chips()
+        if removed and self.chips:
+            del self.chips[-removed:]
+            self._layout_dirty = True
         return self.breadcrumbs[-1] if self.breadcrumbs else None
         
     def reset(self):
@@ -48,32 +77,61 @@ class BreadcrumbManager(MaterialComponent):
     def _update_chips(self):
         """Re-creates the chip components based on the current breadcrumbs."""
         self.chips.clear()
+        self._layout_dirty = True
         
         # Home Chip
-        home_chip = MaterialChip(self.theme, LayoutRegion("crumb_home", 0, 0, 1, len(self.home_icon) + 2), self.home_icon, lambda: self.on_crumb_click("/"))
+        home_chip = MaterialChip(self.theme, LayoutRegion("crumb_home", 0, 0, 1, self._home_width), self.home_icon, partial(self.on_crumb_click, "/"))
         self.chips.append(home_chip)
         
         # Path Chips
         for i, (name, path, _) in enumerate(self.breadcrumbs):
-            # Truncate long names
-            display_name = name if len(name) <= 15 else name[:14] + "…"
-            
-            chip = MaterialChip(
-                self.theme, 
-                LayoutRegion(f"crumb_{i}", 0, 0, 1, len(display_name) + 4),
-                f"{self.separator} {display_name}", 
-                # Use a lambda to capture the correct path for the click handler
-                lambda p=path: self.on_crumb_click(p)
-            )
-            self.chips.append(chip)
+            self.chips.append(self._make_chip(i, name, path))
+
+    def _make_chip(self, index: int, name: str, path: str) -> MaterialChip:
+        """Build the chip for a single crumb."""
+        display_name = _display_name(name)
+        
+        return MaterialChip(
+            self.theme, 
+            LayoutRegion(f"crumb_{index}", 0, 0, 1, cell_width(display_name) + 4),
+            self._sep_prefix + display_name, 
+            partial(self.on_crumb_click, path)
+        )
             
     def draw(self, stdscr):
         """Draws the breadcrumb chips horizontally within the component's region."""
         if not self.visible:
             return
 
-        x, y, width, _ = self.region.x, self.region.y, self.region.width, self.region.height
+        self._ensure_layout()
+        chips = self._visible_chips
+        if not chips:
+            return
+
+        # Chips are laid out edge to edge, so when they all look the same the
+        # row is one string and one addstr
+        style = chips[0].style
+        if all(chip.visible and not chip.focused and chip.style == style for chip in chips):
+            stdscr.addstr(chips[0].region.y, chips[0].region.x, self._joined_line, self.theme.get_color(style))
+            return
+
+        for chip in chips:
+            chip.draw(stdscr)
+
+    def _ensure_layout(self):
+        """Re-run the layout if the chips or the region changed since the last one."""
+        region_key = (self.region.x, self.region.y, self.region.width)
+        if self._layout_dirty or region_key != self._layout_region:
+            self._layout_chips()
+            self._layout_region = region_key
+            self._layout_dirty = False
+
+    def _layout_chips(self):
+        """Position chips left to right, keeping those that fit in the region."""
+        x, y, width = self.region.x, self.region.y, self.region.width
         current_x = x
+        self._visible_chips = []
+        self._chip_xs = []
         
         for chip in self.chips:
             chip_width = chip.region.width
@@ -81,11 +139,14 @@ class BreadcrumbManager(MaterialComponent):
             if current_x + chip_width < x + width:
                 chip.region.x = current_x
                 chip.region.y = y
-                chip.draw(stdscr)
+                self._visible_chips.append(chip)
+                self._chip_xs.append(current_x)
                 current_x += chip_width
             else:
                 # No more space, stop drawing chips
                 break
+
+        self._joined_line = "".join(center_cells(chip.text, chip.region.width) for chip in self._visible_chips)
                 
     def handle_input(self, key: Any) -> bool:
         """Handle mouse clicks to see if a breadcrumb chip was clicked."""
@@ -95,10 +156,16 @@ class BreadcrumbManager(MaterialComponent):
         _, mx, my, _, bstate = key
         
         if bstate & curses.BUTTON1_CLICKED:
-            for chip in self.chips:
-                cx, cy, cw, ch = chip.region.x, chip.region.y, chip.region.width, chip.region.height
-                if cy <= my < cy + ch and cx <= mx < cx + cw:
-                    if chip.on_click:
-                        chip.on_click()
-                        return True # Input was handled
+            # Visible chips share one row and sit side by side, so the hit is
+            # the last chip starting at or before the click column
+            self._ensure_layout()
+            idx = bisect_right(self._chip_xs, mx) - 1
+            if idx < 0:
+                return False
+            chip = self._visible_chips[idx]
+            cx, cy, cw, ch = chip.region.x, chip.region.y, chip.region.width, chip.region.height
+            if cy <= my < cy + ch and cx <= mx < cx + cw:
+                if chip.on_click:
+                    chip.on_click()
+                    return True # Input was handled
         return False
\ No newline at end of file
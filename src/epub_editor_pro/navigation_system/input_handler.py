@@ -7,12 +7,27 @@ from collections import deque
 from pathlib import Path
 from typing import Dict, Callable, List, Tuple, Optional
 
+try:
+    import orjson  # optional C JSON codec for the keymap file
+except ImportError:
+    orjson = None
+
+# Button masks bound once; they are read for every mouse event
+_BUTTON1_PRESSED = curses.BUTTON1_PRESSED
+_BUTTON1_RELEASED = curses.BUTTON1_RELEASED
+
+# Swipe direction indexed by (horizontal << 1) | (movement along that axis is positive)
+_SWIPE_TABLE = ("swipe_up", "swipe_down", "swipe_left", "swipe_right")
+
 class InputHandler:
     def __init__(self, stdscr):
         self.stdscr = stdscr
         # The primary store for key actions, separated by context
         self.contextual_actions: Dict[str, Dict[int, Callable]] = {"global": {}}
         self.current_context = "global"
+        # Key maps consulted on each key press: the current context's, then the global one
+        self._active_actions: Tuple[Dict[int, Callable], Dict[int, Callable]] = (
+            self.contextual_actions["global"], self.contextual_actions["global"])
         
         # Gesture handling
         self.gesture_map: Dict[str, Callable] = {}
@@ -27,14 +42,17 @@ class InputHandler:
         self.last_key_pressed: int = -1
         self.key_repeat_delay = 0.4
         self.key_repeat_interval = 0.08
+        self.next_repeat_time: float = 0 # time.monotonic() deadline for the next repeat
+
+        # Blocking getch wait; keys already queued behind the first one are drained without waiting
+        self.frame_timeout_ms = -1
+        self.max_drain_keys = 64
 
         self.input_history = deque(maxlen=100)
         
     def register_key(self, key: int, action: Callable, context: str = "global"):
         """Register a key action for a specific context."""
-        if context not in self.contextual_actions:
-            self.contextual_actions[context] = {}
-        self.contextual_actions[context][key] = action
+        self.contextual_actions.setdefault(context, {})[key] = action
         
     def register_gesture(self, gesture: str, action: Callable):
         """Register a gesture action."""
@@ -43,36 +61,69 @@ class InputHandler:
     def set_context(self, context: str):
         """Set the current input context."""
         self.current_context = context
+        # Resolved once here so key presses don't look contexts up by name. The
+        # dicts are created if missing, so later register_key calls land in them.
+        self._active_actions = (self.contextual_actions.setdefault(context, {}),
+                                self.contextual_actions.setdefault("global", {}))
         
-    def process_input(self):
-        """Process pending keyboard and mouse/touch input in a non-blocking way."""
+    def set_frame_timeout(self, timeout_ms: int):
+        """Set how long process_input blocks in getch waiting for the first key."""
+        self.frame_timeout_ms = timeout_ms
+        self.stdscr.timeout(timeout_ms)
+
+    def process_input(self) -> bool:
+        """Process pending keyboard and mouse/touch input. Returns True if any key action ran."""
         # --- Keyboard Input ---
-        key = self.stdscr.getch() # This is non-blocking due to nodelay(True) in main loop
+        key = self.stdscr.getch() # Waits at most one frame (see set_frame_timeout)
+        handled = key != -1
 
         if key != -1:
-            self.last_key_press_time = time.time()
-            self.last_key_pressed = key
-            self._execute_key_action(key)
+            # Handle keys that are already queued (e.g. a paste) in this call, so
+            # they share one redraw instead of costing a frame each. They all
+            # arrived by the time getch returned, so they share one timestamp.
+            now = time.monotonic()
+            self.stdscr.timeout(0)
+            try:
+                for _ in range(max(1, self.max_drain_keys)): # The key getch returned is always handled
+                    self._execute_key_action(key, now)
+                    # --- Mouse/Touch Input ---
+                    # Each KEY_MOUSE has exactly one event queued, so idle frames skip the poll.
+                    # Every completed touch is dispatched in arrival order; the drain only
+                    # saves the redraws in between.
+                    if key == curses.KEY_MOUSE:
+                        gesture = self._process_touch_events(now)
+                        if gesture:
+                            self._dispatch_gesture(gesture)
+                    last_key = key
+                    key = self.stdscr.getch()
+                    if key == -1:
+                        break
+                else:
+                    # Cap reached; push the unread key back for the next call
+                    curses.ungetch(key)
+            finally:
+                self.stdscr.timeout(self.frame_timeout_ms)
+            self.last_key_press_time = now
+            self.next_repeat_time = now + self.key_repeat_delay
+            self.last_key_pressed = last_key
         elif self.last_key_pressed != -1:
             # --- Key Repeat Logic ---
-            now = time.time()
-            # Check if we should start repeating
-            if now - self.last_key_press_time > self.key_repeat_delay:
-                # Check if it's time for the next repeat based on the interval
-                time_since_last_action = now - self.input_history[-1][1] if self.input_history else self.key_repeat_interval
-                if time_since_last_action >= self.key_repeat_interval:
-                    self._execute_key_action(self.last_key_pressed)
-        
-        # --- Mouse/Touch Input ---
-        self._process_touch_events()
+            # A single deadline check per idle frame; the deadline only moves when an action runs
+            now = time.monotonic()
+            if now >= self.next_repeat_time:
+                self.next_repeat_time = now + self.key_repeat_interval
+                self._execute_key_action(self.last_key_pressed, now)
+                handled = True
+        return handled
 
-    def _execute_key_action(self, key: int):
-        """Finds and executes the action for a given key."""
-        self.input_history.append((key, time.time()))
+    def _execute_key_action(self, key: int, now: float):
+        """Finds and executes the action for a given key. `now` is the caller's time.monotonic()."""
+        self.input_history.append((key, now))
 
-        action = self.contextual_actions.get(self.current_context, {}).get(key)
+        context_actions, global_actions = self._active_actions
+        action = context_actions.get(key)
         if action is None:
-            action = self.contextual_actions.get("global", {}).get(key)
+            action = global_actions.get(key)
         
         if action:
             action()
@@ -81,51 +132,64 @@ class InputHandler:
         """Map touch coordinates to a gesture string."""
         dx = end[0] - start[0]
         dy = end[1] - start[1]
+        adx = abs(dx)
+        ady = abs(dy)
         
         # Check for tap or long press
-        if abs(dx) < self.gesture_threshold and abs(dy) < self.gesture_threshold:
+        if (adx if adx > ady else ady) < self.gesture_threshold:
             return "long_press" if duration > self.long_press_time else "tap"
         
         # Check for swipe
-        if abs(dx) > abs(dy):
-            return "swipe_right" if dx > 0 else "swipe_left"
-        else:
-            return "swipe_down" if dy > 0 else "swipe_up"
+        horizontal = adx > ady
+        return _SWIPE_TABLE[(horizontal << 1) | ((dx if horizontal else dy) > 0)]
                 
-    def _process_touch_events(self):
-        """Process touch events non-blockingly."""
+    def _dispatch_gesture(self, gesture: str):
+        """Run the action registered for a recognised gesture, if any."""
+        action = self.gesture_map.get(gesture)
+        if action:
+            action() # Call the registered action
+
+    def _process_touch_events(self, now: float) -> Optional[str]:
+        """Read the queued mouse event; returns the gesture it completes, if any."""
         try:
-            # CRITICAL: getmouse() is blocking by default. We rely on the main loop's nodelay(True).
-            mouse_event = self.stdscr.getmouse()
+            # getmouse() only reads an already-queued event; it raises curses.error when there is none.
+            # It is a module-level function, not a window method.
+            mouse_event = curses.getmouse()
             
             # Unpack mouse event data
             _, x, y, _, bstate = mouse_event
             
-            if bstate & curses.BUTTON1_PRESSED:
+            if bstate & _BUTTON1_PRESSED:
                 self.touch_start = (x, y)
-                self.touch_start_time = time.time()
-            elif bstate & curses.BUTTON1_RELEASED and self.touch_start:
-                duration = time.time() - self.touch_start_time
+                self.touch_start_time = now
+            elif bstate & _BUTTON1_RELEASED and self.touch_start:
+                duration = now - self.touch_start_time
                 gesture = self.map_gesture(self.touch_start, (x, y), duration)
-                if gesture in self.gesture_map:
-                    self.gesture_map[gesture]() # Call the registered action
                 self.touch_start = None
+                return gesture
         except curses.error:
             # This exception is raised if no mouse event is in the queue, which is normal.
             self.touch_start = None # Invalidate touch start on error
-            pass
+        return None
             
     def save_keymap(self, file_path: Path, action_registry: Dict[str, Callable]):
         """Save the current key mapping to a file."""
+        # Invert the action registry once to find names from functions
+        name_map = {v: k for k, v in action_registry.items()}
         serializable_map = {}
         for context, actions in self.contextual_actions.items():
-            # Invert the action registry to find names from functions
-            name_map = {v: k for k, v in action_registry.items()}
-            serializable_map[context] = {key: name_map.get(func) for key, func in actions.items() if name_map.get(func)}
+            names = ((key, name_map.get(func)) for key, func in actions.items())
+            serializable_map[context] = {key: name for key, name in names if name}
         
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
         try:
-            with file_path.open('w') as f:
-                json.dump(serializable_map, f, indent=2)
+            # Replace atomically so an interrupted save keeps the previous keymap
+            if orjson is not None:
+                tmp_path.write_bytes(orjson.dumps(serializable_map, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with tmp_path.open('w') as f:
+                    json.dump(serializable_map, f, indent=2)
+            tmp_path.replace(file_path)
             return True
         except OSError:
             return False
@@ -134,14 +198,18 @@ class InputHandler:
         """Load a key mapping from a file."""
         if not file_path.exists(): return False
         try:
-            with file_path.open('r') as f:
-                config = json.load(f)
+            if orjson is not None:
+                config = orjson.loads(file_path.read_bytes()) # orjson.JSONDecodeError subclasses json's
+            else:
+                with file_path.open('r') as f:
+                    config = json.load(f)
             
             self.contextual_actions = {"global": {}}
             for context, keymap in config.items():
                 for key_str, action_name in keymap.items():
                     if action_name in action_registry:
                         self.register_key(int(key_str), action_registry[action_name], context)
+            self.set_context(self.current_context) # The old per-context dicts were replaced
             return True
         except (OSError, json.JSONDecodeError, KeyError):
             return False
@@ -2,8 +2,10 @@
 
 import curses
 import time
+import importlib
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, List, Callable, Optional, Any, Type
+from typing import Deque, Dict, List, Callable, Optional, Any, Tuple, Type, Union
 
 # Import components and base screen for internal use
 from ..ui.material_components import MaterialSnackbar, MaterialCard, MaterialButton
@@ -23,28 +25,55 @@ class ScreenManager:
         self.core_modules = core_modules
         self.layout = self.core_modules.layout
         
-        self.screen_cache: Dict[str, 'BaseScreen'] = {} # Cache to store screen instances
-        self.screen_stack: List['BaseScreen'] = []
+        self.screen_cache: 'OrderedDict[str, BaseScreen]' = OrderedDict() # Screen instances, least recently shown first
+        self.max_cached_screens = 4
+        self.pinned_screens = {"dashboard"} # Never evicted from screen_cache
+        self.eviction_deferred = False # A busy screen kept the cache over its cap
+        # Back history as (screen name, data it was entered with). Names rather than instances,
+        # so screens deep in the history can still be evicted; go_back recreates them.
+        self.max_back_depth = 32
+        self.screen_stack: Deque[Tuple[str, Any]] = deque(maxlen=self.max_back_depth)
         self.current_screen: Optional['BaseScreen'] = None
+        self.current_data: Any = None # Data the current screen was entered with
         self.dialog_stack: List['BaseScreen'] = []
         
-        self.screen_classes: Dict[str, Type['BaseScreen']] = {}
+        # Screen name → class, or a "module:Class" path (relative to the package) imported on first use
+        self.screen_classes: Dict[str, Union[str, Type['BaseScreen']]] = {}
         self.snackbar: Optional['MaterialSnackbar'] = None
         self.running = True
+        self.dirty = True # Set when input or navigation changed what is on screen
 
     def stop(self):
         """Signals the main application loop to terminate."""
         self.running = False
 
+    def mark_dirty(self):
+        """Request a redraw on the next loop iteration."""
+        self.dirty = True
+
+    def is_dirty(self) -> bool:
+        """Whether something changed since the last draw."""
+        return self.dirty
+
+    def wants_tick(self) -> bool:
+        """Whether the screen changes without input (progress, spinner, snackbar timeout)."""
+        if self.snackbar and self.snackbar.visible:
+            return True
+        active_screen = self.get_active_screen()
+        return bool(active_screen and active_screen.is_animating())
+
     def navigate_to(self, screen_name: str, data: Any = None):
         """Navigate to a screen. Uses a cached instance or creates a new one."""
+        self.dirty = True
         if self.current_screen:
             if self.current_screen.name == screen_name: return # Avoid navigating to self
             self.current_screen.on_pause()
-            self.screen_stack.append(self.current_screen)
+            self.screen_stack.append((self.current_screen.name, self.current_data))
             
+        self.current_data = data
         # Check cache for an existing screen instance
         if screen_name in self.screen_cache:
+            self.screen_cache.move_to_end(screen_name)
             self.current_screen = self.screen_cache[screen_name]
             self.current_screen.on_resume(data)
         else:
@@ -56,35 +85,81 @@ class ScreenManager:
             self.show_snackbar("No previous screen.", style="warning")
             return
 
+        self.dirty = True
         if self.current_screen:
             self.current_screen.on_pause()
             
-        self.current_screen = self.screen_stack.pop()
-        self.current_screen.on_resume()
+        screen_name, self.current_data = self.screen_stack.pop()
+        if screen_name in self.screen_cache:
+            self.screen_cache.move_to_end(screen_name)
+            self.current_screen = self.screen_cache[screen_name]
+            self.current_screen.on_resume()
+        else:
+            # Evicted while in the history; rebuild it from the data it was entered with
+            self._load_screen(screen_name, self.current_data)
 
     def _load_screen(self, screen_name: str, data: Any):
         """Instantiates, caches, and sets up a new screen."""
         if screen_name in self.screen_classes:
-            screen_class = self.screen_classes[screen_name]
+            screen_class = self._resolve_screen_class(screen_name)
             instance = screen_class(
                 self.stdscr, self.theme, self.layout, self.input_handler, self, self.core_modules
             )
             self.current_screen = instance
             self.screen_cache[screen_name] = instance # Add to cache
             instance.on_create(data)
+            self._evict_screens()
         else:
             self.show_snackbar(f"Error: Screen '{screen_name}' not found!", style="error")
 
+    def _evict_screens(self):
+        """
+        Destroy least recently shown screens beyond max_cached_screens. Pinned
+        screens and the current one are kept, and so are screens with background
+        work running (is_animating): destroying one would orphan its worker. The
+        eviction is retried from update() once they go idle.
+        """
+        excess = len(self.screen_cache) - self.max_cached_screens
+        if excess <= 0:
+            self.eviction_deferred = False
+            return
+        busy = False
+        for name in list(self.screen_cache):
+            if excess <= 0:
+                break
+            screen = self.screen_cache[name]
+            if name in self.pinned_screens or screen is self.current_screen:
+                continue
+            if screen.is_animating():
+                busy = True
+                continue
+            del self.screen_cache[name]
+            screen.on_destroy()
+            excess -= 1
+        self.eviction_deferred = busy and excess > 0
+
+    def _resolve_screen_class(self, screen_name: str) -> Type['BaseScreen']:
+        """Import a lazily registered screen class and remember it."""
+        screen_class = self.screen_classes[screen_name]
+        if isinstance(screen_class, str):
+            module_path, class_name = screen_class.split(':')
+            module = importlib.import_module(module_path, __package__.rpartition('.')[0])
+            screen_class = self.screen_classes[screen_name] = getattr(module, class_name)
+        return screen_class
+
     def get_active_screen(self) -> Optional['BaseScreen']:
         """Returns the active dialog or the current screen."""
         return self.dialog_stack[-1] if self.dialog_stack else self.current_screen
 
     def handle_input(self):
         """CORRECTED: Delegates to the InputHandler, which then calls the active screen."""
-        self.input_handler.process_input()
+        if self.input_handler.process_input():
+            self.dirty = True
         
     def update(self):
         """Updates the logic of the active screen or dialog."""
+        if self.eviction_deferred:
+            self._evict_screens()
         active_screen = self.get_active_screen()
         if active_screen and hasattr(active_screen, 'update'):
             active_screen.update()
@@ -92,6 +167,7 @@ class ScreenManager:
     def draw(self):
         """Draws the UI. The main loop is responsible for refresh()."""
         # The active screen handles clearing its own area
+        self.dirty = False
         active_screen = self.get_active_screen()
         if active_screen:
             active_screen.draw()
@@ -106,6 +182,7 @@ class ScreenManager:
         style_id = style_map.get(style, self.theme.SECONDARY)
         self.snackbar = MaterialSnackbar(self.theme, message, duration, style_id)
         self.snackbar.show()
+        self.dirty = True
 
     def show_confirm_dialog(self, message: str, on_confirm: Callable, on_cancel: Optional[Callable] = None):
         """Shows a confirmation dialog by pushing it onto the dialog stack."""
@@ -113,12 +190,14 @@ class ScreenManager:
         dialog = ConfirmDialogScreen(self.stdscr, self.theme, self.layout, self.input_handler, self, self.core_modules, dialog_data)
         dialog.on_create()
         self.dialog_stack.append(dialog)
+        self.dirty = True
         self.input_handler.set_context(dialog.name)
 
     def close_dialog(self):
         """Closes the topmost dialog."""
         if self.dialog_stack:
             self.dialog_stack.pop()
+            self.dirty = True
             active_screen = self.get_active_screen()
             if active_screen:
                 self.input_handler.set_context(active_screen.name)
@@ -27,6 +27,7 @@ class BaseScreen:
         self.components: List[Any] = []
         self.focusable_components: List[Any] = []
         self.focused_component_idx: int = -1
+        self._focusables_dirty = True # focusable_components must be rebuilt before use
         
         # State and Lifecycle
         self.state: Dict[str, Any] = {}
@@ -66,6 +67,10 @@ class BaseScreen:
         self.refresh_content()
         
     # --- Methods to be overridden by subclasses ---
+    def is_animating(self) -> bool:
+        """(Override) True while the screen shows progress that changes without input."""
+        return False
+
     def setup_components(self): pass
     def refresh_content(self): pass
     def get_state(self) -> Dict: 
@@ -103,13 +108,28 @@ class BaseScreen:
             return
         
         self.stdscr.erase()
+        self.draw_components()
+
+    def draw_components(self):
+        """Draw visible components, skipping those scrolled entirely off screen."""
+        offset = self.scroll_offset
+        screen_height = self.stdscr.getmaxyx()[0]
         for component in self.components:
-            if component.visible:
-                # Adjust component position for scrolling before drawing
-                original_y = component.region.y
-                component.region.y -= self.scroll_offset
+            if not component.visible:
+                continue
+            region = component.region
+            top = region.y - offset
+            # Skip components scrolled entirely off screen
+            if top >= screen_height or top + region.height <= 0:
+                continue
+            if not offset:
                 component.draw(self.stdscr)
-                component.region.y = original_y # Restore original y for logic
+                continue
+            # Adjust component position for scrolling before drawing
+            original_y = region.y
+            region.y = top
+            component.draw(self.stdscr)
+            region.y = original_y # Restore original y for logic
 
     # --- SCROLLING LOGIC (Merged from previous version) ---
     def calculate_scroll_limit(self):
@@ -139,9 +159,18 @@ class BaseScreen:
     # --- Component & Focus Management ---
     def add_component(self, component: Any):
         self.components.append(component)
+        self._focusables_dirty = True
+
+    def invalidate_focusables(self):
+        """Call after toggling a component's visible/enabled so focus navigation sees it."""
+        self._focusables_dirty = True
 
     def update_focusable_components(self):
+        """Rebuild the focus order, but only if components changed since the last build."""
+        if not self._focusables_dirty:
+            return
         self.focusable_components = [c for c in self.components if hasattr(c, 'focused') and c.visible and c.enabled]
+        self._focusables_dirty = False
 
     def get_focused_component(self) -> Optional[Any]:
         if 0 <= self.focused_component_idx < len(self.focusable_components):
@@ -174,6 +203,7 @@ class BaseScreen:
     def clear_components(self):
         self.components.clear()
         self.focusable_components.clear()
+        self._focusables_dirty = True
         self.focused_component_idx = -1
         
     def save_state(self):
@@ -193,6 +223,11 @@ class BaseScreen:
         if self.screen_manager:
             self.screen_manager.show_confirm_dialog(message, on_confirm, on_cancel)
 
+    def request_redraw(self):
+        """Ask for a redraw on the next frame; safe to call from worker threads."""
+        if self.screen_manager:
+            self.screen_manager.mark_dirty()
+
     def navigate_to(self, screen_name: str, data: Any = None):
         if self.screen_manager:
             self.screen_manager.navigate_to(screen_name, data)
\ No newline at end of file
@@ -28,6 +28,14 @@ class BatchOperationsScreen(BaseScreen):
         self.is_processing = False
         self.executor = ThreadPoolExecutor(max_workers=1)
         self.progress_info = {"current": 0, "total": 0, "message": "Ready"}
+        self.progress_redraw_interval = 0.05 # Seconds between redraw requests from the worker
+        self._progress_epoch = 0 # Bumped by the worker whenever progress_info changes
+        self._drawn_epoch = -1 # Epoch last copied into the progress components
+
+    def on_destroy(self):
+        """Release the worker thread when the screen is evicted."""
+        self.executor.shutdown(wait=False)
+        super().on_destroy()
 
     def on_create(self, data=None):
         """Initialize batch operations screen and load templates."""
@@ -56,6 +64,7 @@ class BatchOperationsScreen(BaseScreen):
         self.add_component(progress_card)
         self.add_component(self.progress_bar_comp)
         self.add_component(self.status_chip_comp)
+        self._drawn_epoch = -1 # Fresh components need the current progress
         
         self.refresh_operations_list()
 
@@ -76,7 +85,8 @@ class BatchOperationsScreen(BaseScreen):
             "case_sensitive": False, "regex": False, "whole_words": False
         }
         self.operations.append(new_op)
-        self.refresh_operations_list()
+        if self.ops_list_comp:
+            self.ops_list_comp.items.append(self._op_label(new_op)) # Only the new row is formatted
         self.show_snackbar("Simulated: Added a new sample operation.")
 
     def remove_operation(self):
@@ -84,18 +94,24 @@ class BatchOperationsScreen(BaseScreen):
         if self.ops_list_comp and 0 <= self.ops_list_comp.selected_index < len(self.operations):
             selected_index = self.ops_list_comp.selected_index
             self.operations.pop(selected_index)
-            self.refresh_operations_list()
+            self.ops_list_comp.items.pop(selected_index)
             self.ops_list_comp.selected_index = min(selected_index, len(self.operations) - 1)
 
     def clear_operations(self):
         """Clear all operations from the queue."""
         self.operations.clear()
-        self.refresh_operations_list()
+        if self.ops_list_comp:
+            self.ops_list_comp.items.clear()
+
+    @staticmethod
+    def _op_label(op: Dict) -> str:
+        """Row text for an operation in the queue list."""
+        return f"'{op['find']}' → '{op['replace']}'"
 
     def refresh_operations_list(self):
-        """Update the list component with the current operations."""
+        """Rebuild every row of the list component (new components, loaded templates)."""
         if self.ops_list_comp:
-            self.ops_list_comp.items = [f"'{op['find']}' → '{op['replace']}'" for op in self.operations]
+            self.ops_list_comp.items = [self._op_label(op) for op in self.operations]
 
     def run_batch(self):
         """Run all operations in the queue asynchronously."""
@@ -111,20 +127,31 @@ class BatchOperationsScreen(BaseScreen):
     def _batch_worker(self):
         """The background worker function for processing the batch."""
         total_ops = len(self.operations)
+        next_redraw = 0.0
         for i, op in enumerate(self.operations):
             self.progress_info['current'] = i
             self.progress_info['message'] = f"Op {i+1}/{total_ops}: Replacing '{op['find']}'"
+            self._progress_epoch += 1
+            # Fast batches would otherwise ask for a frame per operation
+            now = time.monotonic()
+            if now >= next_redraw:
+                next_redraw = now + self.progress_redraw_interval
+                self.request_redraw()
             
             # This call is blocking, but it's in a background thread.
             self.core_modules.replace_engine.pattern_replace(
                 op["find"], op["replace"], op.get("case_sensitive", False),
                 op.get("regex", False), op.get("whole_words", False)
             )
-            time.sleep(0.1) # small delay to make progress visible
 
         self.progress_info['current'] = total_ops
         self.progress_info['message'] = "Batch processing complete."
         self.is_processing = False
+        self._progress_epoch += 1
+        self.request_redraw()
+
+    def is_animating(self) -> bool:
+        return self.is_processing
 
     def load_templates(self):
         """Load operation templates from files."""
@@ -134,6 +161,10 @@ class BatchOperationsScreen(BaseScreen):
     def update_progress_ui(self):
         """Update progress bar and status text based on worker state."""
         if not self.progress_bar_comp or not self.status_chip_comp: return
+        # Nothing new since the components were last updated
+        epoch = self._progress_epoch
+        if epoch == self._drawn_epoch: return
+        self._drawn_epoch = epoch
 
         if self.is_processing:
             self.progress_bar_comp.max_value = self.progress_info['total']
@@ -150,7 +181,6 @@ class BatchOperationsScreen(BaseScreen):
         
         self.update_progress_ui()
         
-        for component in self.components:
-            component.draw(self.stdscr)
+        self.draw_components()
             
         self.draw_footer("A: Add | D: Delete | R: Run | C: Clear")
\ No newline at end of file
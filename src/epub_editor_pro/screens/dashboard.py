@@ -65,11 +65,11 @@ class DashboardScreen(BaseScreen):
     def update_file_stats(self):
         """Update statistics for the currently loaded file."""
         self.file_stats.clear()
-        epub_path_str = self.core_modules.epub_path
-        if epub_path_str:
+        epub_path = self.core_modules.epub_path
+        if epub_path:
             try:
-                stats = os.stat(epub_path_str)
-                self.file_stats[epub_path_str] = {
+                stats = os.stat(epub_path)
+                self.file_stats[epub_path] = {
                     "size": stats.st_size,
                     "modified": datetime.fromtimestamp(stats.st_mtime).strftime("%Y-%m-%d %H:%M"),
                 }
@@ -83,7 +83,7 @@ class DashboardScreen(BaseScreen):
         # File Info Card
         epub_path = self.core_modules.epub_path
         file_info_card = MaterialCard(self.theme, LayoutRegion("file_info", 0, 0, 0, 8), 
-                                     "Current EPUB", Path(epub_path).name if epub_path else "No file loaded")
+                                     "Current EPUB", epub_path.name if epub_path else "No file loaded")
         if epub_path:
             stats = self.file_stats.get(epub_path, {})
             size_mb = f"{stats.get('size', 0) / (1024*1024):.2f} MB"
@@ -132,7 +132,7 @@ class DashboardScreen(BaseScreen):
     def save_current(self):
         """Save the current EPUB file."""
         if self.core_modules.epub_path:
-            success, message = self.core_modules.epub_saver.save_epub(Path(self.core_modules.epub_path))
+            success, message = self.core_modules.epub_saver.save_epub(self.core_modules.epub_path)
             self.show_snackbar(message)
             self.create_cards() # Refresh cards to remove "UNSAVED" chip
         else:
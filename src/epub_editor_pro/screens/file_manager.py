@@ -189,9 +189,12 @@ class FileManagerScreen(BaseScreen):
 
     def save_favorites(self):
         """Save the current list of favorites to a JSON file."""
+        tmp_path = self.favorites_file.with_name(self.favorites_file.name + ".tmp")
         try:
-            with self.favorites_file.open('w') as f:
-                json.dump([str(p) for p in self.favorites], f)
+            # Replace atomically so an interrupted save keeps the previous favorites
+            with tmp_path.open('w') as f:
+                json.dump([str(p) for p in self.favorites], f, separators=(',', ':'))
+            tmp_path.replace(self.favorites_file)
         except OSError as e:
             self.show_snackbar(f"Error saving favorites: {e}", style="error")
 
@@ -200,7 +203,6 @@ class FileManagerScreen(BaseScreen):
         self.stdscr.erase()
         self.draw_header("File Manager")
         
-        for component in self.components:
-            component.draw(self.stdscr)
+        self.draw_components()
 
         self.draw_footer("↑↓: Select | →/Enter: Open | ←: Up | F: Favorite")
\ No newline at end of file
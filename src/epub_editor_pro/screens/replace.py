@@ -159,7 +159,6 @@ class ReplaceScreen(BaseScreen):
         self.stdscr.erase()
         self.draw_header("Find and Replace")
         
-        for component in self.components:
-            component.draw(self.stdscr)
+        self.draw_components()
 
         self.draw_footer("F3: Find Next | Tab: Navigate | Enter: Action")
\ No newline at end of file
@@ -24,6 +24,11 @@ class SearchScreen(BaseScreen):
         self.executor = ThreadPoolExecutor(max_workers=1)
         self.loading_animation_frame = 0
 
+    def on_destroy(self):
+        """Release the worker thread when the screen is evicted."""
+        self.executor.shutdown(wait=False)
+        super().on_destroy()
+
     def setup_components(self):
         """Create UI components for the search screen."""
         main_region = self.layout.get_region("main")
@@ -86,6 +91,8 @@ class SearchScreen(BaseScreen):
             self.core_modules.search_engine.search,
             self.search_pattern, self.case_sensitive, self.regex_mode, self.whole_words
         )
+        # Wake the main loop as soon as results are ready instead of on the idle redraw
+        self.search_future.add_done_callback(lambda _: self.request_redraw())
 
     def on_search_complete(self, results):
         """Callback function for when the search thread finishes."""
@@ -100,6 +107,9 @@ class SearchScreen(BaseScreen):
     def go_to_replace(self):
         self.navigate_to("replace", data={"find": self.search_pattern})
 
+    def is_animating(self) -> bool:
+        return self.is_searching # Spinner frames advance on each redraw
+
     def update(self):
         """Called every frame. Checks for the result of the async search."""
         if self.is_searching and self.search_future and self.search_future.done():
@@ -119,7 +129,6 @@ class SearchScreen(BaseScreen):
             self.stdscr.addstr(y + h // 2, x + w // 2 - 5, f"Searching {frame}")
         else:
             # Draw normal components if not searching
-            for component in self.components:
-                component.draw(self.stdscr)
+            self.draw_components()
         
         self.draw_footer("Enter: Search | C/R/W: Toggle | Tab: Navigate")
\ No newline at end of file
@@ -149,7 +149,6 @@ class SearchResultsScreen(BaseScreen):
         self.stdscr.erase()
         self.draw_header(f"Results for: '{self.search_params.get('pattern', '')}' ({len(self.filtered_results)})")
         
-        for component in self.components:
-            component.draw(self.stdscr)
+        self.draw_components()
             
         self.draw_footer("↑↓: Select | Enter: Preview | R: Replace | A: Replace All")
\ No newline at end of file
@@ -97,9 +97,14 @@ class ColorManager:
         config_dir = Path("config")
         config_dir.mkdir(exist_ok=True)
         
+        themes_path = config_dir / "themes.json"
+        tmp_path = themes_path.with_name(themes_path.name + ".tmp")
         try:
-            with open(config_dir / "themes.json", 'w') as f:
+            # Write a sibling file and rename it over the old one, so a kill mid-write
+            # never leaves a truncated themes.json behind
+            with open(tmp_path, 'w') as f:
                 json.dump(self.themes, f, indent=2)
+            tmp_path.replace(themes_path)
         except OSError as e:
             print(f"Warning: Could not save themes file: {e}")
             
@@ -1,8 +1,26 @@
 import curses
 import time
+import unicodedata
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional, Callable
 from .layout_manager import LayoutRegion
 
+@lru_cache(maxsize=256)
+def cell_width(text: str) -> int:
+    """Terminal columns taken by text: wide/fullwidth characters use two, combining marks none."""
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+    return width
+
+def center_cells(text: str, width: int) -> str:
+    """Center text in width terminal cells; str.center would count code points instead."""
+    pad = max(0, width - cell_width(text))
+    left = pad // 2 + (pad & width & 1) # Same side for the odd space as str.center
+    return " " * left + text + " " * (pad - left)
+
 class MaterialTheme:
     PRIMARY = 1
     SECONDARY = 2
@@ -44,6 +62,9 @@ class MaterialTheme:
         return curses.color_pair(color_id) | curses.A_REVERSE
 
 class MaterialComponent:
+    # Subclasses that declare __slots__ too (e.g. MaterialChip) carry no instance __dict__
+    __slots__ = ('theme', 'region', 'visible', 'focused', 'enabled', '__weakref__')
+
     def __init__(self, theme: MaterialTheme, region: LayoutRegion):
         self.theme = theme
         self.region = region
@@ -325,13 +346,13 @@ class MaterialSnackbar:
         
     def show(self):
         self.visible = True
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
     def draw(self, stdscr):
         if not self.visible:
             return
         
-        if time.time() - self.start_time > self.duration:
+        if time.monotonic() - self.start_time > self.duration:
             self.visible = False
             return
             
@@ -377,6 +398,8 @@ class MaterialProgress(MaterialComponent):
             stdscr.addstr(y, text_x, percent_text, self.theme.get_color(MaterialTheme.TEXT_PRIMARY))
 
 class MaterialChip(MaterialComponent):
+    __slots__ = ('text', 'on_click', 'style')
+
     def __init__(self, theme, region, text, on_click=None, style=MaterialTheme.SECONDARY):
         super().__init__(theme, region)
         self.text = text
@@ -388,7 +411,7 @@ class MaterialChip(MaterialComponent):
             return
 
         x, y, width, height = self.region.x, self.region.y, self.region.width, self.region.height
-        display_text = self.text.center(width)
+        display_text = center_cells(self.text, width)
 
         color = self.theme.get_highlight_color(self.style) if self.focused else self.theme.get_color(self.style)
         stdscr.addstr(y, x, display_text, color)
@@ -0,0 +1,53 @@
+from epub_editor_pro.screens.base_screen import BaseScreen
+from epub_editor_pro.ui.layout_manager import LayoutRegion
+
+
+class _Window:
+    def __init__(self, height=24):
+        self.height = height
+
+    def getmaxyx(self):
+        return self.height, 80
+
+    def erase(self):
+        pass
+
+
+class _Component:
+    def __init__(self, name, y, height, drawn):
+        self.name = name
+        self.region = LayoutRegion(name, y, 0, height, 10)
+        self.visible = True
+        self.drawn = drawn
+
+    def draw(self, stdscr):
+        self.drawn.append((self.name, self.region.y))
+
+
+def _screen(*rows):
+    drawn = []
+    screen = BaseScreen(_Window(), None, None, None, None, None)
+    for name, y, height in rows:
+        screen.components.append(_Component(name, y, height, drawn))
+    return screen, drawn
+
+
+def test_components_below_the_screen_are_skipped():
+    screen, drawn = _screen(('header', 0, 1), ('list', 5, 10), ('buttons', 24, 3), ('edge', 23, 3))
+    screen.draw()
+    assert drawn == [('header', 0), ('list', 5), ('edge', 23)]
+
+
+def test_scrolled_components_are_drawn_at_their_offset_position():
+    screen, drawn = _screen(('top', 2, 2), ('middle', 10, 2), ('bottom', 40, 2))
+    screen.scroll_offset = 5
+    screen.draw_components()
+    assert drawn == [('middle', 5)]
+    assert [c.region.y for c in screen.components] == [2, 10, 40]  # Layout positions restored
+
+
+def test_hidden_components_are_not_drawn():
+    screen, drawn = _screen(('a', 0, 1), ('b', 1, 1))
+    screen.components[0].visible = False
+    screen.draw_components()
+    assert drawn == [('b', 1)]
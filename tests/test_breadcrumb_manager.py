@@ -0,0 +1,102 @@
+import curses
+import unicodedata
+
+import pytest
+
+from epub_editor_pro.navigation_system.breadcrumb_manager import BreadcrumbManager
+from epub_editor_pro.ui.layout_manager import LayoutRegion
+
+
+class _Theme:
+    def get_color(self, style):
+        return 0
+
+    def get_highlight_color(self, style):
+        return 1
+
+
+class _Screen:
+    """Records addstr calls onto a grid of terminal cells"""
+
+    def __init__(self, width=80):
+        self.cells = [' '] * width
+        self.written = []  # Every cell index any addstr touched, in order
+
+    def addstr(self, y, x, text, attr=0):
+        for char in text:
+            self.cells[x] = char
+            self.written.append(x)
+            if unicodedata.east_asian_width(char) in ('W', 'F'):
+                x += 1
+                self.cells[x] = ''  # Covered by the wide character on its left
+                self.written.append(x)
+            x += 1
+
+
+@pytest.fixture
+def clicks():
+    return []
+
+
+@pytest.fixture
+def crumbs(clicks):
+    manager = BreadcrumbManager(_Theme(), LayoutRegion('crumbs', 0, 2, 1, 70), clicks.append)
+    manager.reset()
+    for name, path in (('Search', '/search'), ('検索結果', '/results'), ('Replace', '/replace')):
+        manager.add_crumb(name, path)
+    return manager
+
+
+def _labels_by_chip(screen, manager):
+    return [
+        ''.join(screen.cells[chip.region.x:chip.region.x + chip.region.width]).strip()
+        for chip in manager._visible_chips
+    ]
+
+
+def test_joined_row_keeps_labels_inside_their_chips(crumbs):
+    screen = _Screen()
+    crumbs.draw(screen)
+    assert _labels_by_chip(screen, crumbs) == ['🏠', '› Search', '› 検索結果', '› Replace']
+
+
+def test_single_addstr_row_matches_per_chip_drawing(crumbs):
+    joined, separate = _Screen(), _Screen()
+    crumbs.draw(joined)
+    for chip in crumbs._visible_chips:
+        chip.draw(separate)
+    assert joined.cells == separate.cells
+
+
+def test_each_chip_draws_exactly_its_own_cells(crumbs):
+    crumbs.draw(_Screen())
+    for chip in crumbs._visible_chips:
+        chip.focused = True
+        screen = _Screen()
+        chip.draw(screen)
+        assert screen.written == list(range(chip.region.x, chip.region.x + chip.region.width))
+
+
+def test_focused_chip_row_keeps_labels_inside_their_chips(crumbs):
+    crumbs.draw(_Screen())
+    crumbs._visible_chips[1].focused = True  # Forces per-chip drawing
+    screen = _Screen()
+    crumbs.draw(screen)
+    assert _labels_by_chip(screen, crumbs) == ['🏠', '› Search', '› 検索結果', '› Replace']
+
+
+def test_click_hits_the_chip_under_the_cursor(crumbs, clicks):
+    crumbs.draw(_Screen())
+    for chip, path in zip(crumbs._visible_chips, ('/', '/search', '/results', '/replace')):
+        for mx in (chip.region.x, chip.region.x + chip.region.width - 1):
+            assert crumbs.handle_input((curses.KEY_MOUSE, mx, 0, 0, curses.BUTTON1_CLICKED))
+            assert clicks.pop() == path
+    assert not crumbs.handle_input((curses.KEY_MOUSE, 1, 0, 0, curses.BUTTON1_CLICKED))
+
+
+def test_go_back_and_trail_limit(crumbs):
+    assert crumbs.go_back() == ('検索結果', '/results', None)
+    for i in range(10):
+        crumbs.add_crumb(f'Chapter {i}', f'/c{i}')
+    assert len(crumbs.chips) == len(crumbs.breadcrumbs) + 1 == 8
+    assert crumbs.chips[-1].text == '› Chapter 9'
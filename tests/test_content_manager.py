@@ -0,0 +1,78 @@
+import random
+
+from epub_editor_pro.core.content_manager import ContentManager, _iter_postings
+
+WORDS = ['alpha', 'Beta', 'gamma', 'delta', 'café', 'naïve', 'x1']
+
+
+def _random_text(rng, lines):
+    return '\n'.join(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+        for _ in range(lines)
+    )
+
+
+def _random_edit(rng, content):
+    """Replace, insert or delete a few lines somewhere in content"""
+    lines = content.split('\n')
+    start = rng.randint(0, len(lines))
+    end = min(len(lines), start + rng.randint(0, 3))
+    lines[start:end] = _random_text(rng, rng.randint(0, 3)).split('\n')
+    return '\n'.join(lines)
+
+
+def _index_snapshot(manager, file_path):
+    return {
+        word: sorted(_iter_postings(bucket[file_path]))
+        for word, bucket in manager.file_index.items()
+        if file_path in bucket
+    }
+
+
+def _fresh(file_path, content):
+    manager = ContentManager()
+    manager.add_file(file_path, content)
+    return manager
+
+
+def test_incremental_reindex_matches_full_index():
+    rng = random.Random(7)
+    manager = ContentManager()
+    content = _random_text(rng, 30)
+    manager.add_file('a.xhtml', content)
+    manager.get_line_starts('a.xhtml')
+
+    for _ in range(200):
+        content = _random_edit(rng, content)
+        manager.update_content('a.xhtml', content)
+        fresh = _fresh('a.xhtml', content)
+        assert _index_snapshot(manager, 'a.xhtml') == _index_snapshot(fresh, 'a.xhtml')
+        assert manager.get_line_starts('a.xhtml') == fresh.get_line_starts('a.xhtml')
+        assert manager.stats['total_words'] == fresh.stats['total_words']
+        assert manager.stats['total_chars'] == fresh.stats['total_chars']
+
+
+def test_rollback_restores_each_previous_version():
+    rng = random.Random(11)
+    manager = ContentManager()
+    versions = [_random_text(rng, 20)]
+    manager.add_file('a.xhtml', versions[0])
+    for _ in range(25):
+        versions.append(_random_edit(rng, versions[-1]))
+        manager.update_content('a.xhtml', versions[-1])
+
+    while len(versions) > 1:
+        versions.pop()
+        assert manager.rollback_file('a.xhtml')
+        assert manager.get_content('a.xhtml') == versions[-1]
+        assert _index_snapshot(manager, 'a.xhtml') == _index_snapshot(_fresh('a.xhtml', versions[-1]), 'a.xhtml')
+    assert not manager.has_modifications()
+
+
+def test_line_span_and_locate():
+    manager = _fresh('a.xhtml', 'one\ntwo three\n\nfour')
+    assert manager.line_span('a.xhtml', 2) == (4, 13)
+    assert manager.line_span('a.xhtml', 3) == (14, 14)
+    assert manager.line_span('a.xhtml', 5) is None
+    assert manager.locate('a.xhtml', 8) == (2, 4)
+    assert manager.locate('a.xhtml', 19) == (4, 4)
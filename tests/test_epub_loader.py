@@ -0,0 +1,72 @@
+import zipfile
+
+from epub_editor_pro.app import CoreModules
+from epub_editor_pro.core.epub_loader import EPUBLoader
+
+CONTAINER = b'''<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>'''
+
+OPF = b'''<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Test</dc:title></metadata>
+  <manifest>
+    <item id="c2" href="ch2.xhtml" media-type="application/xhtml+xml"/>
+    <item id="c1" href="ch1.xhtml" media-type="application/xhtml+xml"/>
+    <item id="bad" href="bad.xhtml" media-type="application/xhtml+xml"/>
+    <item id="gone" href="missing.xhtml" media-type="application/xhtml+xml"/>
+    <item id="css" href="style.css" media-type="text/css"/>
+    <item id="img" href="cover.png" media-type="image/png"/>
+  </manifest>
+  <spine><itemref idref="c1"/><itemref idref="c2"/></spine>
+</package>'''
+
+
+def _make_epub(path):
+    with zipfile.ZipFile(path, 'w') as epub:
+        epub.writestr(zipfile.ZipInfo('mimetype'), b'application/epub+zip')
+        epub.writestr('META-INF/container.xml', CONTAINER)
+        epub.writestr('OEBPS/content.opf', OPF)
+        epub.writestr('OEBPS/ch1.xhtml', 'Chapter one café'.encode('utf-8'))
+        epub.writestr('OEBPS/ch2.xhtml', b'<?xml version="1.0" encoding="latin-1"?>caf\xe9')
+        epub.writestr('OEBPS/bad.xhtml', b'broken \xc3\x28 utf-8')
+        epub.writestr('OEBPS/style.css', b'p { margin: 0 }')
+        epub.writestr('OEBPS/cover.png', b'\x89PNG')
+    return path
+
+
+def test_load_decodes_text_files_in_manifest_order(tmp_path):
+    loader = EPUBLoader()
+    assert loader.load_epub(_make_epub(tmp_path / 'book.epub'))
+    assert list(loader.content_map) == ['OEBPS/ch2.xhtml', 'OEBPS/ch1.xhtml', 'OEBPS/style.css']
+    assert loader.content_map['OEBPS/ch1.xhtml'] == 'Chapter one café'
+    assert loader.content_map['OEBPS/ch2.xhtml'].endswith('café')
+    assert loader.spine == ['OEBPS/ch1.xhtml', 'OEBPS/ch2.xhtml']
+    assert loader.metadata['title'][0]['text'] == 'Test'
+
+
+def test_structure_lists_only_loaded_files(tmp_path):
+    loader = EPUBLoader()
+    assert loader.load_epub(_make_epub(tmp_path / 'book.epub'))
+    assert loader.structure['html'] == ['OEBPS/ch2.xhtml', 'OEBPS/ch1.xhtml']
+    assert loader.structure['styles'] == ['OEBPS/style.css']
+    assert not loader.structure['other']
+
+
+def test_core_modules_load_epub(tmp_path):
+    core = CoreModules(layout=None)
+    try:
+        ok, message = core.load_epub(str(_make_epub(tmp_path / 'book.epub')))
+        assert ok, message
+        assert sorted(core.content_manager.content_map) == ['OEBPS/ch1.xhtml', 'OEBPS/ch2.xhtml', 'OEBPS/style.css']
+        assert core.content_manager.search_index('café')
+    finally:
+        core.executor.shutdown()
+
+
+def test_invalid_epub_is_rejected(tmp_path):
+    path = tmp_path / 'book.epub'
+    with zipfile.ZipFile(path, 'w') as epub:
+        epub.writestr('META-INF/container.xml', CONTAINER)
+    assert not EPUBLoader().load_epub(path)
@@ -0,0 +1,138 @@
+import curses
+from collections import deque
+
+import pytest
+
+from epub_editor_pro.navigation_system import input_handler as input_module
+from epub_editor_pro.navigation_system.input_handler import InputHandler
+
+PRESS, RELEASE = curses.BUTTON1_PRESSED, curses.BUTTON1_RELEASED
+
+
+class _Window:
+    """Queued getch input; -1 once the queue is empty, like a timed-out read"""
+
+    def __init__(self):
+        self.keys = deque()
+        self.timeouts = []
+
+    def getch(self):
+        return self.keys.popleft() if self.keys else -1
+
+    def timeout(self, ms):
+        self.timeouts.append(ms)
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    window = _Window()
+    mouse_events = deque()
+
+    def getmouse():
+        if not mouse_events:
+            raise curses.error('no mouse event')
+        return mouse_events.popleft()
+
+    monkeypatch.setattr(input_module.curses, 'mousemask', lambda mask: (mask, 0))
+    monkeypatch.setattr(input_module.curses, 'getmouse', getmouse)
+    monkeypatch.setattr(input_module.curses, 'ungetch', window.keys.appendleft)
+    return window, mouse_events
+
+
+@pytest.fixture
+def handler(terminal):
+    handler = InputHandler(terminal[0])
+    handler.set_frame_timeout(33)
+    return handler
+
+
+def _touch(terminal, start, end):
+    window, mouse_events = terminal
+    for (x, y), state in ((start, PRESS), (end, RELEASE)):
+        window.keys.append(curses.KEY_MOUSE)
+        mouse_events.append((0, x, y, 0, state))
+
+
+def test_queued_keys_are_drained_in_one_call(handler, terminal):
+    window, _ = terminal
+    pressed = []
+    for key in b'abc':
+        handler.register_key(key, lambda key=key: pressed.append(chr(key)), 'editor')
+    handler.set_context('editor')
+    window.keys.extend(b'abcx')
+
+    assert handler.process_input()
+    assert pressed == ['a', 'b', 'c']
+    assert [key for key, _ in handler.input_history] == list(b'abcx')
+    assert window.timeouts[-1] == 33  # Blocking timeout restored after the drain
+
+
+def test_drain_stops_at_the_cap_and_keeps_the_rest(handler, terminal):
+    window, _ = terminal
+    handler.max_drain_keys = 3
+    window.keys.extend(b'abcde')
+    handler.process_input()
+    assert len(handler.input_history) == 3
+    assert list(window.keys) == list(b'de')
+
+
+def test_context_keys_override_global_ones(handler, terminal):
+    window, _ = terminal
+    calls = []
+    handler.register_key(ord('q'), lambda: calls.append('global'))
+    handler.register_key(ord('q'), lambda: calls.append('search'), 'search')
+    window.keys.append(ord('q'))
+    handler.process_input()
+    handler.set_context('search')
+    window.keys.append(ord('q'))
+    handler.process_input()
+    assert calls == ['global', 'search']
+
+
+def test_every_touch_in_a_drain_is_dispatched_in_order(handler, terminal):
+    calls = []
+    for gesture in ('swipe_up', 'swipe_down', 'tap'):
+        handler.register_gesture(gesture, lambda gesture=gesture: calls.append(gesture))
+    _touch(terminal, (10, 20), (10, 5))   # swipe up
+    _touch(terminal, (10, 20), (10, 5))   # a second, separate swipe up
+    _touch(terminal, (3, 3), (4, 3))      # tap
+    _touch(terminal, (10, 5), (10, 20))   # swipe down
+
+    assert handler.process_input()
+    assert calls == ['swipe_up', 'swipe_up', 'tap', 'swipe_down']
+
+
+@pytest.mark.parametrize('end,gesture', [
+    ((0, -9), 'swipe_up'), ((0, 9), 'swipe_down'), ((-9, 1), 'swipe_left'),
+    ((9, -1), 'swipe_right'), ((2, 2), 'tap'),
+])
+def test_map_gesture(handler, end, gesture):
+    assert handler.map_gesture((0, 0), end, 0.1) == gesture
+
+
+def test_long_press(handler):
+    assert handler.map_gesture((0, 0), (1, 0), 1.0) == 'long_press'
+
+
+def test_keymap_round_trip(handler, tmp_path):
+    registry = {'save': lambda: None, 'quit': lambda: None}
+    handler.register_key(ord('s'), registry['save'], 'editor')
+    handler.register_key(ord('q'), registry['quit'])
+    path = tmp_path / 'keymap.json'
+    assert handler.save_keymap(path, registry)
+
+    handler.set_context('editor')
+    assert handler.load_keymap(path, registry)
+    assert handler.contextual_actions == {'global': {ord('q'): registry['quit']}, 'editor': {ord('s'): registry['save']}}
+    assert handler._active_actions[0] is handler.contextual_actions['editor']
+
+
+@pytest.mark.parametrize('cap', [0, 1])
+def test_drain_cap_below_one_still_handles_the_first_key(handler, terminal, cap):
+    window, _ = terminal
+    handler.max_drain_keys = cap
+    window.keys.extend(b'ab')
+    assert handler.process_input()
+    assert [key for key, _ in handler.input_history] == [ord('a')]
+    assert handler.last_key_pressed == ord('a')
+    assert list(window.keys) == [ord('b')]
@@ -0,0 +1,48 @@
+import re
+import warnings
+
+import pytest
+
+from epub_editor_pro.core import regex_cache
+from epub_editor_pro.core.regex_cache import compile_pattern
+
+TEXT = 'foo\nfoo\ncafé bar foo\n'
+
+
+def _subn(compiled, text=TEXT):
+    return compiled.subn('X', text)
+
+
+@pytest.mark.parametrize('pattern', ['foo$', r'o\nf', r'(foo|bar)+', r'caf.', r'\\$'])
+def test_re2_replacements_match_re(pattern):
+    pytest.importorskip('re2')
+    expected = re.compile(pattern, re.IGNORECASE).subn('X', TEXT)
+    assert _subn(compile_pattern(pattern, False, True, False, use_re2=True)) == expected
+
+
+def test_unescaped_dollar_stays_on_re_outside_multiline():
+    assert isinstance(compile_pattern('foo$', True, True, False, use_re2=True), re.Pattern)
+    assert regex_cache._UNESCAPED_DOLLAR.search('foo$')
+    assert regex_cache._UNESCAPED_DOLLAR.search(r'foo\\$')
+    assert not regex_cache._UNESCAPED_DOLLAR.search(r'foo\$')
+    assert not regex_cache._UNESCAPED_DOLLAR.search(r'foo\\\$')
+
+
+def test_literal_patterns_are_escaped():
+    compiled = compile_pattern('a.b$', True, False, False)
+    assert compiled.findall('a.b$ axb') == ['a.b$']
+
+
+def test_invalid_pattern_returns_none():
+    assert compile_pattern('(unclosed', True, True, False) is None
+
+
+@pytest.mark.parametrize('pattern', [r'foo\Z', r'[[:alpha:]]+', r'[^[:digit:]]', r'\w+é', r'(?<=a)b|c$'])
+def test_pcre2_matches_match_re(pattern):
+    pytest.importorskip('pcre2')
+    text = 'ab:c1 foo\nbé cé\nfoo\n'
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)  # re warns about possible nested sets
+        expected = [m.span() for m in re.compile(pattern).finditer(text)]
+        compiled = compile_pattern(pattern, True, True, False, use_pcre2=True)
+    assert [m.span() for m in compiled.finditer(text)] == expected
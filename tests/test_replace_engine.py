@@ -0,0 +1,48 @@
+import re
+
+from epub_editor_pro.core.content_manager import ContentManager
+from epub_editor_pro.core.replace_engine import ReplaceEngine
+
+
+def _engine(files):
+    manager = ContentManager()
+    for path, content in files.items():
+        manager.add_file(path, content)
+    return ReplaceEngine(manager), manager
+
+
+def test_re2_is_opt_in():
+    engine, _ = _engine({})
+    assert engine.use_re2 is False
+
+
+def test_dollar_anchor_matches_before_final_newline():
+    for use_re2 in (False, True):
+        engine, manager = _engine({'a.xhtml': 'foo\nfoo\n'})
+        engine.use_re2 = use_re2
+        stats = engine.pattern_replace('foo$', 'X', case_sensitive=True, regex_mode=True)
+        assert stats.total_replacements == 1
+        assert manager.get_content('a.xhtml') == re.sub('foo$', 'X', 'foo\nfoo\n')
+
+
+def test_literal_replacement_is_not_a_template():
+    engine, manager = _engine({'a.xhtml': 'C:/path and c:/path'})
+    stats = engine.pattern_replace('c:/', r'D:\1\\', case_sensitive=False)
+    assert stats.total_replacements == 2
+    assert manager.get_content('a.xhtml') == r'D:\1\\path and D:\1\\path'
+
+
+def test_replace_and_undo_round_trip():
+    engine, manager = _engine({'a.xhtml': 'one two\nthree four\nfive'})
+    assert engine.replace('a.xhtml', 2, 6, 10, 'FOUR!')
+    assert manager.get_content('a.xhtml') == 'one two\nthree FOUR!\nfive'
+    assert engine.undo_last_replacement()
+    assert manager.get_content('a.xhtml') == 'one two\nthree four\nfive'
+
+
+def test_pattern_replace_across_files_in_order():
+    engine, manager = _engine({'a.xhtml': 'cat cat', 'b.xhtml': 'dog', 'c.xhtml': 'Cat'})
+    stats = engine.pattern_replace('cat', 'cow', files_to_process=['c.xhtml', 'a.xhtml', 'b.xhtml', 'gone'])
+    assert (stats.total_replacements, stats.files_modified, stats.characters_changed) == (3, 2, 0)
+    assert [manager.get_content(path) for path in ('a.xhtml', 'b.xhtml', 'c.xhtml')] == ['cow cow', 'dog', 'cow']
+    assert set(manager.get_modified_files()) == {'a.xhtml', 'c.xhtml'}
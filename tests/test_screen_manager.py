@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+
+from epub_editor_pro.navigation_system.screen_manager import ScreenManager
+
+EVENTS = []
+
+
+class _Screen:
+    def __init__(self, stdscr, theme, layout, input_handler, screen_manager, core_modules):
+        self.name = type(self).__name__.lower()
+        self.data = None
+        self.busy = False
+
+    def on_create(self, data=None):
+        self.data = data
+        EVENTS.append(('create', self.name, data))
+
+    def on_resume(self, data=None):
+        EVENTS.append(('resume', self.name))
+
+    def on_pause(self):
+        pass
+
+    def on_destroy(self):
+        EVENTS.append(('destroy', self.name))
+
+    def is_animating(self):
+        return self.busy
+
+
+SCREENS = {name: type(name.capitalize(), (_Screen,), {}) for name in ('dashboard', 'a', 'b', 'c', 'd', 'e')}
+
+
+@pytest.fixture
+def manager():
+    EVENTS.clear()
+    manager = ScreenManager(None, None, None, SimpleNamespace(layout=None))
+    manager.screen_classes = dict(SCREENS)
+    return manager
+
+
+def _visit(manager, *names):
+    for name in names:
+        manager.navigate_to(name, {'from': name})
+
+
+def test_cache_is_capped_even_with_a_deep_history(manager):
+    _visit(manager, 'dashboard', 'a', 'b', 'c', 'd', 'e')
+    assert len(manager.screen_cache) == manager.max_cached_screens
+    assert list(manager.screen_cache) == ['dashboard', 'c', 'd', 'e']
+    assert ('destroy', 'a') in EVENTS and ('destroy', 'b') in EVENTS
+
+
+def test_go_back_recreates_evicted_screens_with_their_data(manager):
+    _visit(manager, 'dashboard', 'a', 'b', 'c', 'd', 'e')
+    names = []
+    while manager.screen_stack:
+        manager.go_back()
+        names.append(manager.current_screen.name)
+    assert names == ['d', 'c', 'b', 'a', 'dashboard']
+    assert manager.screen_cache['a'].data == {'from': 'a'}
+    assert ('create', 'b', {'from': 'b'}) in EVENTS[EVENTS.index(('destroy', 'b')):]
+    assert len(manager.screen_cache) <= manager.max_cached_screens + len(manager.pinned_screens)
+
+
+def test_go_back_refreshes_recency(manager):
+    _visit(manager, 'dashboard', 'a', 'b', 'c')
+    manager.go_back()
+    manager.go_back()          # b, then a, become the most recently shown
+    _visit(manager, 'd')
+    assert list(manager.screen_cache) == ['dashboard', 'b', 'a', 'd']
+    assert ('destroy', 'c') in EVENTS
+
+
+def test_back_history_is_bounded(manager):
+    for _ in range(40):
+        _visit(manager, 'a', 'b')
+    assert len(manager.screen_stack) == manager.max_back_depth
+
+
+def test_busy_screens_are_not_evicted(manager):
+    _visit(manager, 'dashboard', 'a')
+    worker = manager.current_screen
+    worker.busy = True  # e.g. a batch still running after the user navigated away
+    _visit(manager, 'b', 'c', 'd', 'e')
+    assert manager.screen_cache['a'] is worker
+    assert ('destroy', 'a') not in EVENTS
+    assert list(manager.screen_cache) == ['dashboard', 'a', 'd', 'e']  # Idle screens went instead
+
+
+def test_eviction_resumes_when_the_busy_screen_goes_idle(manager):
+    manager.max_cached_screens = 2
+    _visit(manager, 'dashboard', 'a')
+    worker = manager.current_screen
+    worker.busy = True
+    _visit(manager, 'b')  # Only 'a' could make room, and it is busy
+    assert list(manager.screen_cache) == ['dashboard', 'a', 'b']
+    assert manager.eviction_deferred
+    manager.update()
+    assert manager.screen_cache['a'] is worker
+
+    worker.busy = False
+    manager.update()
+    assert list(manager.screen_cache) == ['dashboard', 'b']
+    assert ('destroy', 'a') in EVENTS
+    assert not manager.eviction_deferred
+
+
+def test_returning_to_a_busy_screen_reuses_its_instance(manager):
+    _visit(manager, 'dashboard', 'a')
+    worker = manager.current_screen
+    worker.busy = True
+    _visit(manager, 'b', 'c', 'd', 'e')
+    _visit(manager, 'a')
+    assert manager.current_screen is worker
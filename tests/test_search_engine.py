@@ -0,0 +1,89 @@
+import gc
+import re
+
+import pytest
+
+from epub_editor_pro.core.content_manager import ContentManager
+from epub_editor_pro.core.search_engine import SearchEngine
+
+CONTENT = '\tbar\nfoo bar\nfoo\n<p>Café foo</p>\n\nbar foo \nFOO'
+
+PATTERNS = [
+    r'foo', r'\Afoo', r'foo\Z', r'^foo', r'foo$', r'foo(?=\s)', r'(?<=\n)foo',
+    r'(?<!o )foo', r'o\s', r'bar\nfoo', r'\bcaf\w', r'\w+$', r'f.o',
+]
+
+
+def _baseline(pattern, content, flags):
+    """Line-by-line matching, as the search engine has always reported results"""
+    regex = re.compile(pattern, flags)
+    return [
+        (line_num, match.start(), match.end(), match.group())
+        for line_num, line in enumerate(content.split('\n'), 1)
+        for match in regex.finditer(line)
+    ]
+
+
+@pytest.fixture
+def engine():
+    manager = ContentManager()
+    manager.add_file('a.xhtml', CONTENT)
+    engine = SearchEngine(manager)
+    yield engine
+    engine.executor.shutdown()
+
+
+def _spans(results):
+    return [(r.line_number, r.start_pos, r.end_pos, r.match_text) for r in results]
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+@pytest.mark.parametrize('case_sensitive', [True, False])
+def test_regex_search_matches_line_by_line_baseline(engine, pattern, case_sensitive):
+    flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+    results = engine.search(pattern, case_sensitive=case_sensitive, regex_mode=True)
+    assert _spans(results) == _baseline(pattern, CONTENT, flags)
+
+
+@pytest.mark.parametrize('use_re2,use_pcre2', [(False, False), (True, False), (False, True)])
+def test_backends_agree_with_re(engine, use_re2, use_pcre2):
+    engine.use_re2, engine.use_pcre2 = use_re2, use_pcre2
+    for pattern in PATTERNS:
+        engine.search_cache.clear()
+        results = engine.search(pattern, case_sensitive=True, regex_mode=True)
+        assert _spans(results) == _baseline(pattern, CONTENT, re.MULTILINE), pattern
+
+
+@pytest.mark.parametrize('pattern', ['foo', 'FOO', 'café', 'o b', 'a.b'])
+def test_literal_search_matches_baseline(engine, pattern):
+    results = engine.search(pattern)
+    assert _spans(results) == _baseline(re.escape(pattern), CONTENT, re.IGNORECASE)
+
+
+def test_whole_word_and_context(engine):
+    results = engine.search('bar', case_sensitive=True, whole_word=True, context_size=3)
+    assert [(r.line_number, r.context_before, r.context_after) for r in results] == [
+        (1, '\t', ''), (2, 'oo ', ''), (6, '', ' fo'),
+    ]
+
+
+def test_max_results_truncates(engine):
+    results = engine.search('foo', max_results=2)
+    assert len(results) == 2
+    assert engine.last_search_stats['truncated']
+
+
+def test_cache_is_cleared_on_edit(engine):
+    assert len(engine.search('foo')) == 5
+    engine.content_manager.update_content('a.xhtml', CONTENT.replace('FOO', 'bar'))
+    assert len(engine.search('foo')) == 4
+
+
+def test_results_do_not_pin_file_content(engine):
+    manager = engine.content_manager
+    manager.add_file('big.xhtml', ('filler text ' * 50 + '\n') * 20 + 'needle here')
+    original = manager.get_content('big.xhtml')
+    for regex_mode, pattern in ((False, 'needle'), (True, r'\Aneedle|needle')):
+        results = engine.search(pattern, regex_mode=regex_mode)
+        assert results and results[0].context_after == ' here'
+        assert not any(value is original for result in results for value in gc.get_referents(result))